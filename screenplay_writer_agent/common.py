@@ -0,0 +1,48 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Screenplay syntax and settings helpers shared by the linter, paginator, fast path and workers."""
+
+import os
+import re
+
+# Scene heading prefixes: interior, exterior, both, and establishing shots
+_HEADING_PREFIX = r"(?:INT\./EXT\.|INT/EXT\.|I/E\.|INT\.|EXT\.|EST\.)"
+
+HEADING = re.compile(rf"^{_HEADING_PREFIX}\s", re.IGNORECASE)
+# The same prefixes at the start of any line of a multi-line string
+HEADING_LINE = re.compile(rf"^[ \t]*{_HEADING_PREFIX}[ \t]", re.IGNORECASE | re.MULTILINE)
+# Blank lines, possibly holding whitespace, separate screenplay blocks
+BLOCK_SEPARATOR = re.compile(r"\n[ \t]*\n")
+
+# Character cues are short all-caps lines
+MAX_CUE_CHARS = 30
+
+
+def is_transition(line: str) -> bool:
+    """Whether an all-caps line is a transition such as FADE IN: or CUT TO:."""
+    upper = line.upper()
+    return line.isupper() and (upper.startswith("FADE") or upper.endswith("TO:"))
+
+
+def is_character_cue(line: str) -> bool:
+    """Whether a stripped line is a character cue such as ``SARAH`` or ``MARK (V.O.)``."""
+    return (
+        line.isupper()
+        and len(line) < MAX_CUE_CHARS
+        and not HEADING.match(line)
+        and not is_transition(line)
+        and not line.startswith(("(", "["))
+        and not line.endswith((":", "."))
+    )
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """Read a true/false setting such as ``PROFILING_ENABLED=true`` from the environment."""
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
@@ -0,0 +1,241 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Detect inputs that are already scripts or transcripts so they can be formatted without the LLM."""
+
+import itertools
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+
+from screenplay_writer_agent.common import BLOCK_SEPARATOR, HEADING, is_character_cue, is_transition
+
+# Input kinds
+KIND_IDEA = "idea"
+KIND_SCREENPLAY = "screenplay"
+KIND_FOUNTAIN = "fountain"
+KIND_TRANSCRIPT = "transcript"
+
+_SPEAKER = re.compile(r"^([A-Za-z][A-Za-z0-9 .'-]{0,30}):\s*(\S.*)$")
+_FOUNTAIN_TITLE_KEY = re.compile(r"^(Title|Credit|Author|Authors|Source|Draft date|Contact|Copyright|Notes):", re.I)
+_FOUNTAIN_LINE = re.compile(r"^(?:@\S|>.*|\.[A-Za-z]|={3,}\s*$|#+ |= |~)")
+_NOTE = re.compile(r"\[\[[^\]]*\]\]")
+_BRACKETED = re.compile(r"^[\[(](.*)[\])]$")
+_FOUNTAIN_HEADING = re.compile(r"^\.[A-Za-z]")
+# Fields of a structured idea brief, which would otherwise read as speakers or a cue list
+_BRIEF_FIELD = re.compile(
+    r"^(?:genre|setting|logline|tone|characters?|plot|title|premise|synopsis|theme)\s*:", re.IGNORECASE
+)
+
+# An instruction line in front of the script must ask for formatting, and nothing else
+_FORMAT_REQUEST = re.compile(r"\b(?:re)?format|\bconvert\b|\bclean(?:\s|-)?up\b|\bfountain\b", re.IGNORECASE)
+_CREATIVE_REQUEST = re.compile(
+    r"\b(?:write|create|develop|expand|rewrite|transform|continue|improve|add|make it|genre|translate|"
+    r"punch up|shorten|summari[sz]e|thriller|comedy|drama|horror|romance|sci-fi|story|idea)\b",
+    re.IGNORECASE,
+)
+
+# Transcripts need at least this many speaker lines, making up this share of all lines, and a
+# speaker who talks more than once
+MIN_SPEAKER_LINES = 2
+MIN_SPEAKER_SHARE = 0.5
+
+
+@dataclass
+class FastPathStats:
+    """Counts how often requests are served without the LLM."""
+
+    local: Counter = field(default_factory=Counter)
+    llm: int = 0
+    local_ms: float = 0.0
+
+    @property
+    def total(self) -> int:
+        """Requests formatted locally or by the crew."""
+        return sum(self.local.values()) + self.llm
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of requests served by the fast path."""
+        return sum(self.local.values()) / self.total if self.total else 0.0
+
+    def record_local(self, kind: str, elapsed_ms: float) -> None:
+        """Record a request served locally."""
+        self.local[kind] += 1
+        self.local_ms += elapsed_ms
+
+    def record_llm(self) -> None:
+        """Record a request that was sent to the crew."""
+        self.llm += 1
+
+    def summary(self) -> str:
+        """One-line summary for logs."""
+        hits = sum(self.local.values())
+        kinds = ", ".join(f"{kind}={count}" for kind, count in sorted(self.local.items()))
+        average = self.local_ms / hits if hits else 0.0
+        return f"{hits}/{self.total} requests ({self.hit_rate:.0%}) on fast path [{kinds}], avg {average:.1f} ms"
+
+
+def _repeats(names: list[str]) -> bool:
+    """Whether a speaker comes back, as in an exchange rather than a list of fields or characters."""
+    return len(set(names)) < len(names)
+
+
+def classify_input(text: str) -> str:
+    """Return whether the text is an idea or already a screenplay, Fountain script or transcript."""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if len(lines) < 2:
+        return KIND_IDEA
+    # A Fountain title page may open a script; any other brief field ("Genre:", "Characters:") marks an idea
+    if any(_BRIEF_FIELD.match(line) for line in itertools.dropwhile(_FOUNTAIN_TITLE_KEY.match, lines)):
+        return KIND_IDEA
+
+    headings = sum(1 for line in lines if HEADING.match(line) or _FOUNTAIN_HEADING.match(line))
+    cues = [
+        line.partition("(")[0].strip()
+        for line, following in itertools.pairwise(lines)
+        if is_character_cue(line) and not is_character_cue(following)
+    ]
+    speakers = [
+        match.group(1).strip().lower() for line in lines if (match := _SPEAKER.match(line)) and not HEADING.match(line)
+    ]
+    fountain = bool(_FOUNTAIN_TITLE_KEY.match(lines[0])) or any(_FOUNTAIN_LINE.match(line) for line in lines)
+
+    # Dialogue under a scene heading, or cues that come back as the characters talk
+    if cues and (headings or _repeats(cues)):
+        return KIND_FOUNTAIN if fountain else KIND_SCREENPLAY
+    if len(speakers) >= MIN_SPEAKER_LINES and len(speakers) >= MIN_SPEAKER_SHARE * len(lines) and _repeats(speakers):
+        return KIND_TRANSCRIPT
+    return KIND_IDEA
+
+
+def _is_script_line(line: str) -> bool:
+    """Whether a stripped line belongs to a script or transcript rather than an instruction about it."""
+    return bool(
+        HEADING.match(line)
+        or _SPEAKER.match(line)
+        or _FOUNTAIN_TITLE_KEY.match(line)
+        or _FOUNTAIN_LINE.match(line)
+        or _BRACKETED.match(line)
+        or is_character_cue(line)
+        or is_transition(line)
+    )
+
+
+def split_request(text: str) -> tuple[str | None, str]:
+    """Split a leading instruction line ("Format this dialogue:") from the material."""
+    first, _, rest = text.strip().partition("\n")
+    if rest.strip() and not _is_script_line(first.strip()):
+        return first.strip(), rest
+    return None, text
+
+
+def _strip_boneyard(text: str) -> str:
+    """Remove Fountain /* ... */ comments in one linear scan."""
+    parts = []
+    pos = 0
+    while (start := text.find("/*", pos)) >= 0:
+        end = text.find("*/", start + 2)
+        if end < 0:
+            break
+        parts.append(text[pos:start])
+        pos = end + 2
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+def _fountain_to_draft(text: str) -> str:
+    """Turn Fountain markup into the plain draft layout the formatter understands."""
+    text = _NOTE.sub("", _strip_boneyard(text))
+    blocks = BLOCK_SEPARATOR.split(text.strip())
+    if blocks and _FOUNTAIN_TITLE_KEY.match(blocks[0].lstrip()):
+        blocks = blocks[1:]
+
+    lines = []
+    for block in blocks:
+        for raw in block.splitlines():
+            line = raw.strip()
+            if not line or re.fullmatch(r"={3,}", line) or line.startswith(("#", "= ")):
+                continue
+            if line.startswith(">") and line.endswith("<"):
+                line = line[1:-1].strip()
+            elif line.startswith(">"):
+                line = line[1:].strip()
+            elif line.startswith("@") or _FOUNTAIN_HEADING.match(line):
+                line = line[1:].upper()
+            elif line.startswith(("!", "~")):
+                line = line[1:].strip()
+            lines.append(line)
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _join_dialogue(text: str) -> str:
+    """Join multi-line speeches so each cue is followed by one line per dialogue run."""
+    blocks = []
+    for block in BLOCK_SEPARATOR.split(text):
+        lines = [line.strip() for line in block.splitlines() if line.strip()]
+        if len(lines) > 1 and is_character_cue(lines[0]):
+            joined = [lines[0]]
+            for line in lines[1:]:
+                if line.startswith("(") or joined[-1].startswith("(") or len(joined) == 1:
+                    joined.append(line)
+                else:
+                    joined[-1] = f"{joined[-1]} {line}"
+            lines = joined
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+def _transcript_to_draft(text: str) -> str:
+    """Turn "NAME: line" transcripts into cue/dialogue blocks."""
+    blocks: list[list[str]] = []
+    speaking = False
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            speaking = False
+            continue
+        speaker = _SPEAKER.match(line)
+        if speaker and not HEADING.match(line):
+            name, speech = speaker.group(1).strip().upper(), speaker.group(2).strip()
+            block = [name]
+            if speech.startswith("(") and ")" in speech:
+                parenthetical, _, speech = speech.partition(")")
+                block.append(parenthetical + ")")
+                speech = speech.strip()
+            if speech:
+                block.append(speech)
+            blocks.append(block)
+            speaking = True
+        elif bracketed := _BRACKETED.match(line):
+            blocks.append([bracketed.group(1).strip()])
+            speaking = False
+        elif speaking:
+            blocks[-1][-1] = f"{blocks[-1][-1]} {line}"
+        else:
+            blocks.append([line])
+    return "\n\n".join("\n".join(block) for block in blocks)
+
+
+def prepare_local_draft(text: str) -> tuple[str, str] | None:
+    """Return (kind, draft) when the input can be formatted without the LLM, else None."""
+    instruction, material = split_request(text)
+    # Any leading prose that is not a plain formatting request ("Translate to French:") needs the crew
+    if instruction is not None and (not _FORMAT_REQUEST.search(instruction) or _CREATIVE_REQUEST.search(instruction)):
+        return None
+
+    kind = classify_input(material)
+    if kind == KIND_IDEA:
+        return None
+    if kind == KIND_TRANSCRIPT:
+        return kind, _transcript_to_draft(material)
+    if kind == KIND_FOUNTAIN:
+        return kind, _join_dialogue(_fountain_to_draft(material))
+    return kind, _join_dialogue(material)
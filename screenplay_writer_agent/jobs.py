@@ -0,0 +1,351 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Persistent asynchronous job queue for long-running screenplay generations."""
+
+import asyncio
+import contextlib
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from screenplay_writer_agent.log import get_logger, request_context
+
+logger = get_logger("jobs")
+
+# Job states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+# Defaults (overridable through environment variables in main.py)
+DEFAULT_JOB_STORE_PATH = "screenplay_jobs.db"
+DEFAULT_JOB_WORKERS = 2
+DEFAULT_JOB_RESULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_POLL_INTERVAL_SECONDS = 1.0
+DEFAULT_JOB_MAX_ATTEMPTS = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    input TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_queue_idx ON jobs (status, priority DESC, created_at);
+CREATE INDEX IF NOT EXISTS jobs_finished_idx ON jobs (finished_at);
+"""
+
+
+@dataclass
+class Job:
+    """A single screenplay generation job."""
+
+    id: str
+    input: str
+    priority: int
+    status: str
+    result: str | None = None
+    error: str | None = None
+    attempts: int = 0
+    created_at: float = 0.0
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    def to_dict(self, include_result: bool = False) -> dict:
+        """Return a JSON-serializable view of the job."""
+        data = {
+            "job_id": self.id,
+            "status": self.status,
+            "priority": self.priority,
+            "attempts": self.attempts,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.error:
+            data["error"] = self.error
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+class JobStore:
+    """SQLite-backed job store that survives process restarts."""
+
+    def __init__(self, path: str | Path = DEFAULT_JOB_STORE_PATH) -> None:
+        """Open (creating if needed) the SQLite database at ``path``."""
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            if self.path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def submit(self, input_text: str, priority: int = 0) -> Job:
+        """Persist a new queued job and return it."""
+        job = Job(
+            id=uuid.uuid4().hex,
+            input=input_text,
+            priority=priority,
+            status=JOB_QUEUED,
+            created_at=time.time(),
+        )
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, input, priority, status, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job.id, job.input, job.priority, job.status, job.created_at),
+            )
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        """Return the job with the given id, if any."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row else None
+
+    def claim_next(self) -> Job | None:
+        """Atomically move the highest-priority, oldest queued job to running."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY priority DESC, created_at LIMIT 1",
+                    (JOB_QUEUED,),
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                started_at = time.time()
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, started_at = ?, attempts = attempts + 1 WHERE id = ?",
+                    (JOB_RUNNING, started_at, row["id"]),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        job = _row_to_job(row)
+        job.status = JOB_RUNNING
+        job.started_at = started_at
+        job.attempts += 1
+        return job
+
+    def complete(self, job_id: str, result: str) -> None:
+        """Mark a job as done and store its result."""
+        self._finish(job_id, JOB_DONE, result=result)
+
+    def fail(self, job_id: str, error: str) -> None:
+        """Mark a job as failed and store the error message."""
+        self._finish(job_id, JOB_FAILED, error=error)
+
+    def _finish(self, job_id: str, status: str, result: str | None = None, error: str | None = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status, result, error, time.time(), job_id),
+            )
+
+    def fail_exhausted(self, max_attempts: int) -> int:
+        """Fail interrupted jobs that have already been started ``max_attempts`` times."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE status = ? AND attempts >= ?",
+                (JOB_FAILED, f"Interrupted {max_attempts} times; giving up", time.time(), JOB_RUNNING, max_attempts),
+            )
+        return cursor.rowcount
+
+    def requeue_interrupted(self) -> int:
+        """Return jobs left running by a crashed process to the queue."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?",
+                (JOB_QUEUED, JOB_RUNNING),
+            )
+        return cursor.rowcount
+
+    def purge_expired(self, ttl_seconds: float, now: float | None = None) -> int:
+        """Delete finished jobs whose results are older than the retention TTL."""
+        cutoff = (now if now is not None else time.time()) - ttl_seconds
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                (JOB_DONE, JOB_FAILED, cutoff),
+            )
+        return cursor.rowcount
+
+    def counts(self) -> dict[str, int]:
+        """Return the number of jobs in each state."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+
+def _row_to_job(row: sqlite3.Row) -> Job:
+    """Convert a database row into a Job."""
+    return Job(
+        id=row["id"],
+        input=row["input"],
+        priority=row["priority"],
+        status=row["status"],
+        result=row["result"],
+        error=row["error"],
+        attempts=row["attempts"],
+        created_at=row["created_at"],
+        started_at=row["started_at"],
+        finished_at=row["finished_at"],
+    )
+
+
+class JobQueue:
+    """Worker pool that drains a JobStore by running jobs through a coroutine.
+
+    The runner must raise on failure: whatever it returns is stored as the
+    job's result. Jobs whose process died mid-run are re-queued on start until
+    they have been started ``max_attempts`` times, then marked failed.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        runner: Callable[[str], Awaitable[str]],
+        workers: int = DEFAULT_JOB_WORKERS,
+        result_ttl_seconds: float = DEFAULT_JOB_RESULT_TTL_SECONDS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        max_attempts: int = DEFAULT_JOB_MAX_ATTEMPTS,
+    ) -> None:
+        """Create a stopped pool of ``workers`` draining ``store`` through ``runner``."""
+        self.store = store
+        self.runner = runner
+        self.workers = max(1, workers)
+        self.result_ttl_seconds = result_ttl_seconds
+        self.poll_interval = poll_interval
+        self.max_attempts = max(1, max_attempts)
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._stopping = False
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker pool has been started."""
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        """Recover interrupted jobs and start the worker pool."""
+        if self._tasks:
+            return
+        self._stopping = False
+        self._loop = asyncio.get_running_loop()
+        exhausted = self.store.fail_exhausted(self.max_attempts)
+        if exhausted:
+            logger.error("❌ Failed %d job(s) interrupted %d times", exhausted, self.max_attempts)
+        requeued = self.store.requeue_interrupted()
+        if requeued:
+            logger.warning("🔄 Re-queued %d interrupted job(s)", requeued)
+        self.store.purge_expired(self.result_ttl_seconds)
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info("✅ Job queue started with %d worker(s)", self.workers)
+
+    def start_in_thread(self, timeout: float = 30.0) -> None:
+        """Start the worker pool on its own event loop in a background thread.
+
+        Used at server startup, before the server's event loop exists.
+        """
+        if self._thread is not None:
+            return
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def serve() -> None:
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.start())
+            finally:
+                started.set()
+            loop.run_forever()
+            loop.close()
+
+        self._thread = threading.Thread(target=serve, name="job-workers", daemon=True)
+        self._thread.start()
+        started.wait(timeout)
+
+    async def stop(self) -> None:
+        """Stop the workers; running jobs are re-queued on the next start."""
+        thread, self._thread = self._thread, None
+        if thread is not None and self._loop is not None:
+            # Stop the workers on their own loop, then shut that loop down
+            loop = self._loop
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self.stop(), loop))
+            loop.call_soon_threadsafe(loop.stop)
+            await asyncio.to_thread(thread.join)
+            return
+        self._stopping = True
+        tasks, self._tasks = self._tasks, []
+        # Workers started on a loop that has since closed cannot be awaited here
+        loop = asyncio.get_running_loop()
+        tasks = [task for task in tasks if task.get_loop() is loop and not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def submit(self, input_text: str, priority: int = 0) -> Job:
+        """Queue a new job and wake an idle worker."""
+        job = self.store.submit(input_text, priority)
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            # Workers may run on another thread's loop; asyncio.Event is not thread-safe
+            loop.call_soon_threadsafe(self._wakeup.set)
+        return job
+
+    async def _worker(self, worker_id: int) -> None:
+        last_purge = time.monotonic()
+        while not self._stopping:
+            job = self.store.claim_next()
+            if job is None:
+                if time.monotonic() - last_purge > self.poll_interval * 60:
+                    self.store.purge_expired(self.result_ttl_seconds)
+                    last_purge = time.monotonic()
+                self._wakeup.clear()
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                continue
+
+            try:
+                with request_context(job.id):
+                    result = await self.runner(job.input)
+            except asyncio.CancelledError:
+                # Leave the job running so requeue_interrupted picks it up again.
+                raise
+            except Exception as e:
+                logger.exception("❌ Job %s failed on worker %d", job.id, worker_id)
+                self.store.fail(job.id, str(e))
+            else:
+                self.store.complete(job.id, result)
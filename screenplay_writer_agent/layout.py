@@ -0,0 +1,293 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Page-accurate screenplay layout: per-element margins, page breaks and a page index."""
+
+import re
+from dataclasses import dataclass, field
+
+from screenplay_writer_agent.common import BLOCK_SEPARATOR, HEADING, is_character_cue, is_transition
+
+# Element kinds
+SCENE_HEADING = "scene_heading"
+ACTION = "action"
+CHARACTER = "character"
+PARENTHETICAL = "parenthetical"
+DIALOGUE = "dialogue"
+TRANSITION = "transition"
+
+
+@dataclass(frozen=True)
+class ElementStyle:
+    """Indent and width in characters of 12pt Courier (10 characters per inch)."""
+
+    indent: int
+    width: int
+
+
+# Industry margins measured from the 1.5" left text margin of a US Letter page
+STYLES = {
+    SCENE_HEADING: ElementStyle(indent=0, width=60),
+    ACTION: ElementStyle(indent=0, width=60),
+    CHARACTER: ElementStyle(indent=20, width=38),
+    PARENTHETICAL: ElementStyle(indent=15, width=25),
+    DIALOGUE: ElementStyle(indent=10, width=35),
+    TRANSITION: ElementStyle(indent=45, width=15),
+}
+
+# Body lines per page at 6 lines per inch with 1" top and bottom margins
+LINES_PER_PAGE = 55
+PAGE_NUMBER_COLUMN = 71
+MORE = "(MORE)"
+CONTD = " (CONT'D)"
+
+# Action and dialogue keep at least this many lines on each side of a page break
+MIN_SPLIT_LINES = 2
+
+# A hyphen or an en dash (U+2013) separates the pages
+_PAGE_RANGE = re.compile(r"^\s*(\d+)\s*(?:[-\u2013]\s*(\d+))?\s*$")
+
+
+def wrap(text: str, width: int) -> list[str]:
+    """Greedy word wrap; words longer than ``width`` are hard-split."""
+    lines: list[str] = []
+    current = ""
+    for word in text.split():
+        while len(word) > width:
+            if current:
+                lines.append(current)
+                current = ""
+            lines.append(word[:width])
+            word = word[width:]
+        if not current:
+            current = word
+        elif len(current) + 1 + len(word) <= width:
+            current = f"{current} {word}"
+        else:
+            lines.append(current)
+            current = word
+    if current or not lines:
+        lines.append(current)
+    return lines
+
+
+def render_element(kind: str, text: str) -> list[str]:
+    """Wrap and indent one element with its industry margins."""
+    style = STYLES[kind]
+    if kind == TRANSITION and not text.upper().startswith("FADE IN"):
+        # Transitions are right-aligned against the right text margin
+        right = style.indent + style.width
+        return [line.rjust(right) for line in wrap(text, style.width)]
+    indent = " " * (0 if kind == TRANSITION else style.indent)
+    return [indent + line for line in wrap(text, style.width)]
+
+
+@dataclass
+class Element:
+    """One screenplay element; dialogue blocks carry their speech as parts."""
+
+    kind: str
+    text: str
+    parts: list[tuple[str, str]] = field(default_factory=list)
+
+
+def parse_elements(text: str) -> list[Element]:
+    """Classify the blank-line separated blocks of a screenplay into elements."""
+    elements: list[Element] = []
+    for block in BLOCK_SEPARATOR.split(text):
+        lines = [line.strip() for line in block.splitlines() if line.strip()]
+        i = 0
+        while i < len(lines):
+            line = lines[i]
+            if HEADING.match(line):
+                elements.append(Element(SCENE_HEADING, line.upper()))
+                i += 1
+            elif is_transition(line):
+                elements.append(Element(TRANSITION, line))
+                i += 1
+            elif is_character_cue(line) and i + 1 < len(lines):
+                parts: list[tuple[str, str]] = []
+                for speech in lines[i + 1 :]:
+                    if speech.startswith("(") and speech.endswith(")"):
+                        parts.append((PARENTHETICAL, speech))
+                    elif parts and parts[-1][0] == DIALOGUE:
+                        parts[-1] = (DIALOGUE, f"{parts[-1][1]} {speech}")
+                    else:
+                        parts.append((DIALOGUE, speech))
+                elements.append(Element(CHARACTER, line, parts))
+                i = len(lines)
+            else:
+                action = [line]
+                i += 1
+                while i < len(lines) and not (HEADING.match(lines[i]) or is_transition(lines[i])):
+                    action.append(lines[i])
+                    i += 1
+                elements.append(Element(ACTION, " ".join(action)))
+    return elements
+
+
+class _PageBuilder:
+    """Accumulates laid-out lines, starting a new page when the current one is full."""
+
+    def __init__(self, lines_per_page: int) -> None:
+        self.lines_per_page = lines_per_page
+        self.pages: list[list[str]] = [[]]
+
+    @property
+    def page(self) -> list[str]:
+        return self.pages[-1]
+
+    def room(self, spaced: bool = True) -> int:
+        """Lines still free on this page, after the blank line that precedes an element."""
+        gap = 1 if spaced and self.page else 0
+        return self.lines_per_page - len(self.page) - gap
+
+    def place(self, lines: list[str], spaced: bool = True) -> None:
+        if spaced and self.page:
+            self.page.append("")
+        self.page.extend(lines)
+
+    def new_page(self) -> None:
+        if self.page:
+            self.pages.append([])
+
+
+def _first_lines(element: Element) -> int:
+    """Lines of an element that must follow a scene heading onto the same page."""
+    if element.kind == CHARACTER:
+        return 1 + min(MIN_SPLIT_LINES, sum(len(render_element(kind, text)) for kind, text in element.parts))
+    return min(MIN_SPLIT_LINES, len(render_element(element.kind, element.text)))
+
+
+def _place_action(builder: _PageBuilder, lines: list[str]) -> None:
+    while lines:
+        room = builder.room()
+        if len(lines) <= room:
+            builder.place(lines)
+            return
+        if room >= MIN_SPLIT_LINES and len(lines) - room >= MIN_SPLIT_LINES:
+            builder.place(lines[:room])
+            lines = lines[room:]
+        elif not builder.page:
+            # A block taller than a page must break somewhere
+            take = max(room, 1)
+            builder.place(lines[:take])
+            lines = lines[take:]
+        builder.new_page()
+
+
+def _place_dialogue(builder: _PageBuilder, element: Element) -> None:
+    cue = element.text
+    body = [(kind, line) for kind, text in element.parts for line in render_element(kind, text)]
+    more = " " * STYLES[CHARACTER].indent + MORE
+    while True:
+        cue_line = render_element(CHARACTER, cue)
+        room = builder.room()
+        if len(cue_line) + len(body) <= room:
+            builder.place(cue_line + [line for _, line in body])
+            return
+        # Fill the page, leaving room for (MORE), and never end a page on a parenthetical
+        take = room - len(cue_line) - 1
+        while take > 0 and body[take - 1][0] == PARENTHETICAL:
+            take -= 1
+        if not builder.page and take < 1:
+            # Page too short to split on; let the block overflow rather than loop
+            builder.place(cue_line + [line for _, line in body])
+            return
+        if take >= MIN_SPLIT_LINES or not builder.page:
+            builder.place(cue_line + [line for _, line in body[:take]] + [more])
+            body = body[take:]
+            if not cue.endswith(CONTD):
+                cue += CONTD
+        builder.new_page()
+
+
+class PageRangeError(ValueError):
+    """A page range that cannot be parsed, runs backwards or starts past the last page."""
+
+    def __init__(self, spec: str, last_page: int | None = None) -> None:
+        """Report the offending range as given, and the last page when the range starts past it."""
+        detail = f" (last page is {last_page})" if last_page is not None else ""
+        super().__init__(f"Invalid page range: {spec}{detail}")
+
+
+@dataclass
+class PageIndex:
+    """A laid-out screenplay with the character offset of every page."""
+
+    text: str
+    offsets: list[int]
+
+    @property
+    def page_count(self) -> int:
+        """Number of pages."""
+        return len(self.offsets)
+
+    def page_span(self, start: int, end: int | None = None) -> tuple[int, int]:
+        """Return the character span of pages ``start`` through ``end`` (1-based, inclusive)."""
+        end = start if end is None else end
+        if not 1 <= start <= end:
+            raise PageRangeError(f"{start}-{end}")
+        if start > self.page_count:
+            return len(self.text), len(self.text)
+        end = min(end, self.page_count)
+        stop = self.offsets[end] if end < self.page_count else len(self.text)
+        return self.offsets[start - 1], stop
+
+    def pages(self, start: int, end: int | None = None) -> str:
+        """Return the text of pages ``start`` through ``end`` (1-based, inclusive)."""
+        begin, stop = self.page_span(start, end)
+        return self.text[begin:stop]
+
+
+def parse_page_range(spec: str) -> tuple[int, int]:
+    """Parse "30-45", "7", or a range with an en dash, into a (start, end) page range."""
+    match = _PAGE_RANGE.match(str(spec))
+    if not match:
+        raise PageRangeError(repr(spec))
+    start = int(match.group(1))
+    return start, int(match.group(2) or start)
+
+
+def paginate(text: str, lines_per_page: int = LINES_PER_PAGE) -> PageIndex:
+    """Lay out a screenplay in a single pass and index where every page starts."""
+    builder = _PageBuilder(lines_per_page)
+    elements = parse_elements(text)
+
+    for position, element in enumerate(elements):
+        if element.kind == CHARACTER:
+            _place_dialogue(builder, element)
+            continue
+        lines = render_element(element.kind, element.text)
+        if element.kind == SCENE_HEADING:
+            # Keep a heading with the start of what follows it
+            following = _first_lines(elements[position + 1]) + 1 if position + 1 < len(elements) else 0
+            if len(lines) + following > builder.room():
+                builder.new_page()
+            builder.place(lines)
+        elif element.kind == TRANSITION:
+            if len(lines) > builder.room():
+                builder.new_page()
+            builder.place(lines)
+        else:
+            _place_action(builder, lines)
+
+    chunks: list[str] = []
+    offsets: list[int] = []
+    length = 0
+    for number, page in enumerate(builder.pages, start=1):
+        header = [f"{number}.".rjust(PAGE_NUMBER_COLUMN), ""] if number > 1 else []
+        chunk = "\n".join(header + page) + "\n"
+        if number > 1:
+            # Form feed so printers and viewers break pages in the same place
+            chunk = "\f" + chunk
+        offsets.append(length)
+        chunks.append(chunk)
+        length += len(chunk)
+    return PageIndex(text="".join(chunks), offsets=offsets)
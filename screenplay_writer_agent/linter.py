@@ -0,0 +1,199 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Score screenplay scenes for format compliance and repair only the failing ones."""
+
+import asyncio
+import itertools
+import re
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from textwrap import dedent
+
+from screenplay_writer_agent.common import BLOCK_SEPARATOR, HEADING, HEADING_LINE, is_character_cue
+
+# Issue codes, mirroring the IMPORTANT rules of the writing task
+ISSUE_MISSING_HEADING = "missing_heading"
+ISSUE_PROSE_PARAGRAPH = "prose_paragraph"
+ISSUE_WE_SEE = "we_see"
+ISSUE_MIXED_DIALOGUE = "mixed_dialogue"
+
+ISSUE_PENALTIES = {
+    ISSUE_MISSING_HEADING: 0.5,
+    ISSUE_PROSE_PARAGRAPH: 0.3,
+    ISSUE_WE_SEE: 0.25,
+    ISSUE_MIXED_DIALOGUE: 0.3,
+}
+
+ISSUE_DESCRIPTIONS = {
+    ISSUE_MISSING_HEADING: 'The scene has no "INT. LOCATION - TIME" or "EXT. LOCATION - TIME" heading.',
+    ISSUE_PROSE_PARAGRAPH: "Action is written as prose paragraphs instead of short visual lines.",
+    ISSUE_WE_SEE: 'Action uses "We see" or "We hear".',
+    ISSUE_MIXED_DIALOGUE: "Dialogue is mixed into action lines instead of under a character name.",
+}
+
+DEFAULT_PASS_SCORE = 0.8
+DEFAULT_MAX_REPAIRS = 3
+
+# Action blocks longer than this, or with more sentences, read as prose
+MAX_ACTION_CHARS = 300
+MAX_ACTION_SENTENCES = 3
+
+_WE_SEE = re.compile(r"\bwe (?:see|hear)\b", re.IGNORECASE)
+# Directions that legitimately take a colon in action, e.g. "INSERT: The letter" or "SUPER: Paris"
+_DIRECTION = r"(?i:insert|super(?:impose)?|title|card|caption|chyron|on screen|close on|angle on|pov|intercut|back to)"
+# "Sarah: line" written into action; the speaker is one to three capitalized words
+_SCRIPT_DIALOGUE = re.compile(rf"^(?!{_DIRECTION}\b)[A-Z][A-Za-z.'-]*(?: [A-Z][A-Za-z.'-]*){{0,2}}:\s+\S")
+_QUOTED_SPEECH = re.compile(r"[\"“][^\"”\n]{2,}[,.!?][\"”]")
+# Quoted text introduced like this is written on something (a sign, a letter), not spoken
+_WRITTEN_INTRO = re.compile(r"(?::|\b(?:reads?|written|printed|labell?ed|titled))$", re.IGNORECASE)
+_SENTENCE_END = re.compile(r"[.!?](?:\s|$)")
+_FADE_LINE = re.compile(r"^[ \t]*FADE (?:IN|OUT)[:.]?[ \t]*$", re.IGNORECASE | re.MULTILINE)
+
+
+@dataclass
+class SceneReport:
+    """Compliance result for a single scene."""
+
+    index: int
+    score: float
+    issues: list[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        """Whether the scene meets the default compliance score."""
+        return self.score >= DEFAULT_PASS_SCORE
+
+
+def split_scenes(text: str) -> list[str]:
+    """Split a screenplay into chunks that each start at a scene heading.
+
+    Text before the first heading (``FADE IN:``, stray action) becomes its own
+    leading chunk so the scenes can be joined back together unchanged.
+    """
+    starts = [match.start() for match in HEADING_LINE.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    starts.append(len(text))
+    return [text[start:end] for start, end in itertools.pairwise(starts) if start != end]
+
+
+def _is_transition_line(line: str) -> bool:
+    """Whether a line is a transition such as FADE IN:, CUT TO: or DISSOLVE TO:."""
+    return line.strip().upper().startswith(("FADE", "CUT TO", "DISSOLVE"))
+
+
+def _is_preamble(scene: str) -> bool:
+    """Whether a chunk holds only transitions such as FADE IN:/FADE OUT."""
+    lines = [line for line in scene.splitlines() if line.strip()]
+    return all(_is_transition_line(line) for line in lines)
+
+
+def _has_quoted_speech(action: str) -> bool:
+    """Whether action quotes spoken lines, as opposed to signs, letters or screens."""
+    for match in _QUOTED_SPEECH.finditer(action):
+        intro = action[max(0, match.start() - 20) : match.start()].rstrip()
+        if any(char.islower() for char in match.group()) and not _WRITTEN_INTRO.search(intro):
+            return True
+    return False
+
+
+def lint_scene(scene: str, index: int = 0) -> SceneReport:
+    """Score one scene against the writing task formatting rules."""
+    issues: set[str] = set()
+    stripped = scene.strip()
+    lines = [line for line in stripped.splitlines() if line.strip()]
+
+    # Transitions may open a scene, but whatever follows them must start with a heading
+    body = list(itertools.dropwhile(_is_transition_line, lines))
+    if body and not HEADING.match(body[0].strip()):
+        issues.add(ISSUE_MISSING_HEADING)
+
+    for block in BLOCK_SEPARATOR.split(stripped):
+        block_lines = [line.strip() for line in block.splitlines() if line.strip()]
+        if not block_lines:
+            continue
+        head = block_lines[0]
+        if HEADING.match(head) or _is_transition_line(head):
+            block_lines = block_lines[1:]
+            if not block_lines:
+                continue
+            head = block_lines[0]
+        if is_character_cue(head):
+            continue
+
+        action = " ".join(block_lines)
+        if _WE_SEE.search(action):
+            issues.add(ISSUE_WE_SEE)
+        if any(_SCRIPT_DIALOGUE.match(line) for line in block_lines) or _has_quoted_speech(action):
+            issues.add(ISSUE_MIXED_DIALOGUE)
+        if len(action) > MAX_ACTION_CHARS or len(_SENTENCE_END.findall(action)) > MAX_ACTION_SENTENCES:
+            issues.add(ISSUE_PROSE_PARAGRAPH)
+
+    ordered = sorted(issues)
+    score = max(0.0, 1.0 - sum(ISSUE_PENALTIES[issue] for issue in ordered))
+    return SceneReport(index=index, score=round(score, 2), issues=ordered)
+
+
+def lint_screenplay(text: str) -> list[SceneReport]:
+    """Lint every scene of a screenplay."""
+    return [lint_scene(scene, index) for index, scene in enumerate(split_scenes(text))]
+
+
+def build_repair_prompt(scene: str, issues: list[str]) -> str:
+    """Build a short prompt asking the LLM to fix the formatting of one scene."""
+    problems = "\n".join(f"- {ISSUE_DESCRIPTIONS[issue]}" for issue in issues)
+    return dedent("""
+        Rewrite this screenplay scene in strict screenplay format. Keep the same story,
+        characters and dialogue; only fix these problems:
+        {problems}
+
+        Rules: scene heading "INT./EXT. LOCATION - TIME" in caps, short present-tense action lines,
+        character names in caps on their own line with dialogue below, no "We see" or "We hear".
+        Return ONLY the rewritten scene.
+
+        SCENE:
+        {scene}
+    """).format(problems=problems, scene=scene.strip())
+
+
+async def repair_screenplay(
+    text: str,
+    repair: Callable[[str], Awaitable[str]],
+    max_repairs: int = DEFAULT_MAX_REPAIRS,
+    pass_score: float = DEFAULT_PASS_SCORE,
+) -> tuple[str, list[SceneReport]]:
+    """Send only the failing scenes to ``repair`` and splice the results back in.
+
+    ``repair`` receives a repair prompt and returns the rewritten scene. A repair
+    is kept only if it lints better than the original. Returns the spliced text
+    and the original reports of the scenes that were replaced.
+    """
+    scenes = split_scenes(text)
+    reports = [lint_scene(scene, index) for index, scene in enumerate(scenes)]
+    failing = [report for report in reports if report.score < pass_score and not _is_preamble(scenes[report.index])]
+    failing = sorted(failing, key=lambda report: report.score)[: max(0, max_repairs)]
+    if not failing:
+        return text, []
+
+    results = await asyncio.gather(
+        *(repair(build_repair_prompt(scenes[report.index], report.issues)) for report in failing),
+        return_exceptions=True,
+    )
+    spliced = []
+    for report, repaired in zip(failing, results, strict=True):
+        if isinstance(repaired, BaseException) or not repaired or not repaired.strip():
+            continue
+        repaired = _FADE_LINE.sub("", repaired)
+        if lint_scene(repaired, report.index).score > report.score:
+            trailing = "\n\n" if scenes[report.index].endswith("\n") else ""
+            scenes[report.index] = repaired.strip() + trailing
+            spliced.append(report)
+
+    return "".join(scenes), spliced
@@ -0,0 +1,266 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Non-blocking structured logging: bounded queue, background writer, sampling and prompt redaction."""
+
+import contextvars
+import hashlib
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+LOGGER_NAME = "screenplay_writer_agent"
+
+DEFAULT_QUEUE_SIZE = 10_000
+DEFAULT_MAX_MESSAGE_CHARS = 2_000
+DEFAULT_PROMPT_PREVIEW_CHARS = 0
+DROP_REPORT_INTERVAL_SECONDS = 30.0
+
+_request_id: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="-")
+
+# Applied to prompt previews before they are logged
+_REDACTIONS = (
+    (re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+"), "[email]"),
+    (re.compile(r"\b(?:sk|pk|key|token)[-_][A-Za-z0-9_-]{8,}\b", re.IGNORECASE), "[secret]"),
+    (re.compile(r"\b\d[\d -]{7,}\d\b"), "[number]"),
+)
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "request_id"}
+
+
+def get_logger(name: str | None = None) -> logging.Logger:
+    """Return the package logger or one of its children."""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+
+def new_request_id() -> str:
+    """Generate a short id for correlating the log lines of one request."""
+    return uuid.uuid4().hex[:12]
+
+
+@contextmanager
+def request_context(request_id: str | None = None) -> Iterator[str]:
+    """Tag every log line emitted inside the block, including in awaited coroutines, with a request id."""
+    request_id = request_id or new_request_id()
+    token = _request_id.set(request_id)
+    try:
+        yield request_id
+    finally:
+        _request_id.reset(token)
+
+
+def describe_prompt(text: str, preview_chars: int | None = None) -> dict:
+    """Summarize prompt text for logs: length and hash, plus an optional redacted preview."""
+    if preview_chars is None:
+        preview_chars = int(os.getenv("LOG_PROMPT_PREVIEW_CHARS", str(DEFAULT_PROMPT_PREVIEW_CHARS)))
+    summary = {"chars": len(text), "sha256": hashlib.sha256(text.encode()).hexdigest()[:12]}
+    if preview_chars > 0:
+        preview = text[:preview_chars]
+        for pattern, replacement in _REDACTIONS:
+            preview = pattern.sub(replacement, preview)
+        summary["preview"] = preview + ("..." if len(text) > preview_chars else "")
+    return summary
+
+
+def parse_sampling(spec: str) -> dict[int, float]:
+    """Parse "DEBUG=0.1,INFO=1" into per-level keep rates."""
+    rates: dict[int, float] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        level, _, rate = item.partition("=")
+        rates[logging.getLevelName(level.strip().upper())] = float(rate)
+    return rates
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach the current request id and drop records according to per-level sampling."""
+
+    def __init__(self, sampling: dict[int, float] | None = None) -> None:
+        """Keep ``sampling[level]`` of the records at each level; unlisted levels are all kept."""
+        super().__init__()
+        self.sampling = sampling or {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Drop a sampled-out record, otherwise tag it with the current request id."""
+        rate = self.sampling.get(record.levelno, 1.0)
+        if rate < 1.0 and random.random() >= rate:  # noqa: S311
+            return False
+        record.request_id = _request_id.get()
+        return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that never blocks: records are dropped and counted when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        """Hand records to ``log_queue``, which should be bounded."""
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge the message args; formatting and tracebacks happen on the writer thread."""
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Queue the record, or count it as dropped if the queue is full."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with long messages truncated."""
+
+    def __init__(self, max_message_chars: int = DEFAULT_MAX_MESSAGE_CHARS) -> None:
+        """Cut messages longer than ``max_message_chars``."""
+        super().__init__()
+        self.max_message_chars = max_message_chars
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Render the record, its request id and ``extra`` fields as one JSON line."""
+        message = record.getMessage()
+        if len(message) > self.max_message_chars:
+            message = f"{message[: self.max_message_chars]}... [{len(message) - self.max_message_chars} more chars]"
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "msg": message,
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for local development."""
+
+    def __init__(self, max_message_chars: int = DEFAULT_MAX_MESSAGE_CHARS) -> None:
+        """Cut messages longer than ``max_message_chars``."""
+        super().__init__("%(asctime)s %(levelname)s [%(request_id)s] %(message)s")
+        self.max_message_chars = max_message_chars
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        """Render the line, followed by any ``extra`` fields as JSON."""
+        if len(record.message) > self.max_message_chars:
+            record.message = f"{record.message[: self.max_message_chars]}..."
+        extra = {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS}
+        line = super().formatMessage(record)
+        return f"{line} {json.dumps(extra, default=str, ensure_ascii=False)}" if extra else line
+
+
+class _DropReporter(logging.Handler):
+    """Writer-side handler that periodically reports records dropped on a full queue."""
+
+    def __init__(self, target: logging.Handler, source: DroppingQueueHandler) -> None:
+        super().__init__()
+        self.target = target
+        self.source = source
+        self._reported = 0
+        self._last_report = time.monotonic()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.target.handle(record)
+        dropped = self.source.dropped
+        if dropped != self._reported and time.monotonic() - self._last_report > DROP_REPORT_INTERVAL_SECONDS:
+            notice = logging.LogRecord(LOGGER_NAME, logging.WARNING, __file__, 0, "Log queue full", None, None)
+            notice.request_id = "-"
+            notice.dropped = dropped - self._reported
+            self.target.handle(notice)
+            self._reported = dropped
+            self._last_report = time.monotonic()
+
+
+class LoggingPipeline:
+    """Owns the bounded queue, the request-path handler and the background writer."""
+
+    def __init__(
+        self,
+        stream=None,
+        level: int = logging.INFO,
+        fmt: str = "json",
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        sampling: dict[int, float] | None = None,
+        max_message_chars: int = DEFAULT_MAX_MESSAGE_CHARS,
+    ) -> None:
+        """Build the pipeline; nothing is routed through it until start()."""
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.handler = DroppingQueueHandler(self.queue)
+        self.handler.addFilter(RequestContextFilter(sampling))
+        writer = logging.StreamHandler(stream or sys.stdout)
+        writer.setFormatter(JsonFormatter(max_message_chars) if fmt == "json" else TextFormatter(max_message_chars))
+        self.listener = logging.handlers.QueueListener(self.queue, _DropReporter(writer, self.handler))
+        self.level = level
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self) -> None:
+        """Route the package logger through the queue and start the writer thread."""
+        with self._lock:
+            if self._started:
+                return
+            logger = get_logger()
+            logger.addHandler(self.handler)
+            logger.setLevel(self.level)
+            logger.propagate = False
+            self.listener.start()
+            self._started = True
+
+    def stop(self) -> None:
+        """Flush queued records and stop the writer thread."""
+        with self._lock:
+            if not self._started:
+                return
+            get_logger().removeHandler(self.handler)
+            self.listener.stop()
+            self._started = False
+
+    @property
+    def dropped(self) -> int:
+        """Records dropped because the queue was full."""
+        return self.handler.dropped
+
+
+_pipeline: LoggingPipeline | None = None
+
+
+def setup_logging() -> LoggingPipeline:
+    """Configure the package logger from LOG_* environment variables and start the writer."""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = LoggingPipeline(
+            level=logging.getLevelName(os.getenv("LOG_LEVEL", "INFO").upper()),
+            fmt=os.getenv("LOG_FORMAT", "json").lower(),
+            queue_size=int(os.getenv("LOG_QUEUE_SIZE", str(DEFAULT_QUEUE_SIZE))),
+            sampling=parse_sampling(os.getenv("LOG_SAMPLING", "")),
+            max_message_chars=int(os.getenv("LOG_MAX_MESSAGE_CHARS", str(DEFAULT_MAX_MESSAGE_CHARS))),
+        )
+    _pipeline.start()
+    return _pipeline
+
+
+def shutdown_logging() -> None:
+    """Flush and stop the logging pipeline."""
+    if _pipeline is not None:
+        _pipeline.stop()
@@ -11,30 +11,104 @@
 
 import argparse
 import asyncio
+import gc
 import json
 import os
 import re
 import sys
-import traceback
+import threading
+import time
+from contextvars import ContextVar
 from pathlib import Path
 from textwrap import dedent
 
 from bindu.penguin.bindufy import bindufy
 from crewai import Agent, Crew, Process, Task
+from crewai.events import LLMStreamChunkEvent, crewai_event_bus
 from dotenv import load_dotenv
 
+from screenplay_writer_agent.common import env_flag
+from screenplay_writer_agent.fastpath import FastPathStats, prepare_local_draft
+from screenplay_writer_agent.jobs import (
+    DEFAULT_JOB_MAX_ATTEMPTS,
+    DEFAULT_JOB_RESULT_TTL_SECONDS,
+    DEFAULT_JOB_STORE_PATH,
+    DEFAULT_JOB_WORKERS,
+    JobQueue,
+    JobStore,
+)
+from screenplay_writer_agent.layout import (
+    ACTION,
+    DIALOGUE,
+    PARENTHETICAL,
+    PageIndex,
+    PageRangeError,
+    paginate,
+    parse_page_range,
+    render_element,
+)
+from screenplay_writer_agent.linter import DEFAULT_MAX_REPAIRS, repair_screenplay
+from screenplay_writer_agent.log import describe_prompt, get_logger, request_context, setup_logging, shutdown_logging
+from screenplay_writer_agent.memory import MemoryConfig, MemoryMonitor
+from screenplay_writer_agent.profiling import Profiler, ProfilingConfig
+from screenplay_writer_agent.prompt_cache import PromptCache, PromptCacheConfig
+from screenplay_writer_agent.repetition import RepetitionDetector, trim_repetition
+
 # Load environment variables from .env file
 load_dotenv()
 
+logger = get_logger("main")
+
 # Error constants
 ERROR_NO_API_KEY = "No API key available"
 ERROR_CREW_NOT_INITIALIZED = "Crew not initialized"
 ERROR_API_CONFIG = "API key configuration error"
+ERROR_JOB_NOT_FOUND = "Job not found"
+
+# Input limits (see "Limits" in README.md)
+MAX_INPUT_CHARS = int(os.getenv("MAX_INPUT_CHARS", "5000"))
+MAX_FORMAT_INPUT_CHARS = int(os.getenv("MAX_FORMAT_INPUT_CHARS", "2000000"))
+# Badly formatted scenes re-sent to the LLM per screenplay
+MAX_SCENE_REPAIRS = int(os.getenv("MAX_SCENE_REPAIRS", str(DEFAULT_MAX_REPAIRS)))
+# Longer lines are never treated as scene headers, which keeps the header regex linear
+MAX_SCENE_HEADER_CHARS = 120
+
+_FENCE = "```"
+_FADE_IN = re.compile(r"FADE IN", re.IGNORECASE)
+# Marker crewai agents put in front of their answer
+_FINAL_ANSWER = "Final Answer:"
+
+# Repetition detector fed by the LLM stream of the crew running in the current thread
+_stream_detector: ContextVar[RepetitionDetector | None] = ContextVar("stream_detector", default=None)
+
+# Job API actions accepted as JSON user content
+JOB_ACTIONS = ("submit", "status", "result")
+
+# Page indexes of recently fetched job results, oldest first
+PAGE_INDEX_CACHE_SIZE = 32
+_page_indexes: dict[str, PageIndex] = {}
 
 # Global variables
 crew: Crew | None = None
+repair_llm = None
+job_queue: JobQueue | None = None
 _initialized = False
 _init_lock = asyncio.Lock()
+# Crew recycling runs on both the server loop and the job workers' loop
+_recycle_lock = threading.Lock()
+
+# Opt-in profiling (PROFILING_ENABLED=true)
+profiler = Profiler(ProfilingConfig.from_env())
+
+# Per-worker memory accounting and crew recycling
+memory_monitor = MemoryMonitor(MemoryConfig.from_env())
+
+# Drafts, transcripts and Fountain input are formatted locally without the LLM
+FAST_PATH_ENABLED = env_flag("FAST_PATH_ENABLED", default=True)
+fast_path_stats = FastPathStats()
+
+# Opt-in cache of crew output for near-duplicate prompts (PROMPT_CACHE_ENABLED=true)
+prompt_cache = PromptCache(PromptCacheConfig.from_env())
 
 
 def load_config() -> dict:
@@ -51,10 +125,10 @@ def load_config() -> dict:
                 with open(config_path) as f:
                     return json.load(f)
             except Exception as e:
-                print(f"⚠️  Error reading {config_path}: {type(e).__name__}")
+                logger.warning("⚠️  Error reading %s: %s", config_path, type(e).__name__)
                 continue
 
-    print("⚠️  No agent_config.json found, using default configuration")
+    logger.warning("⚠️  No agent_config.json found, using default configuration")
     return {
         "name": "screenplay-writer",
         "description": "AI screenplay writing agent for professional script development",
@@ -98,15 +172,13 @@ def _handle_character_dialogue(
 
     # Check for parenthetical
     if line.startswith("(") and line.endswith(")"):
-        parenthetical = " " * 15 + line
-        result_lines.append(parenthetical)
+        result_lines.extend(render_element(PARENTHETICAL, line))
         return in_dialogue, current_character
 
     # If we're in dialogue mode and have a character
     if in_dialogue and current_character:
         # This is dialogue
-        dialogue = " " * 10 + line
-        result_lines.append(dialogue)
+        result_lines.extend(render_element(DIALOGUE, line))
         result_lines.append("")
         in_dialogue = False
         current_character = ""
@@ -116,32 +188,75 @@ def _handle_character_dialogue(
 
 def _handle_action_description(line: str, result_lines: list[str]) -> None:
     """Handle action description lines with wrapping."""
-    # Split long action lines into shorter ones
-    if len(line) > 60:
-        words = line.split()
-        current_line = []
-        current_len = 0
-
-        for word in words:
-            if current_len + len(word) + 1 > 60:
-                result_lines.append(" ".join(current_line))
-                current_line = [word]
-                current_len = len(word)
-            else:
-                current_line.append(word)
-                current_len += len(word) + 1
+    # Split long action lines at the action margin
+    result_lines.extend(render_element(ACTION, line))
+    result_lines.append("")
 
-        if current_line:
-            result_lines.append(" ".join(current_line))
-    else:
-        result_lines.append(line)
 
-    result_lines.append("")
+def _truncate_at_line(text: str, limit: int) -> str:
+    """Cut text to at most ``limit`` characters, preferring a line boundary."""
+    if len(text) <= limit:
+        return text
+    cut = text.rfind("\n", 0, limit)
+    return text[: cut if cut > 0 else limit]
+
+
+def _strip_code_fences(text: str) -> str:
+    """Remove fenced blocks in one linear scan.
+
+    Equivalent to ``re.sub(r"```.*?```", "", text, flags=re.DOTALL)``: fences
+    pair up left to right and a dangling opening fence is left untouched.
+    """
+    parts = []
+    pos = 0
+    while True:
+        start = text.find(_FENCE, pos)
+        if start < 0:
+            break
+        end = text.find(_FENCE, start + len(_FENCE))
+        if end < 0:
+            break
+        parts.append(text[pos:start])
+        pos = end + len(_FENCE)
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+def _strip_fade_in(text: str) -> str:
+    r"""Remove every "FADE IN" through the end of its line in one linear scan.
+
+    Equivalent to ``re.sub(r"FADE IN.*?\n", "", text, flags=re.IGNORECASE)``.
+    """
+    parts = []
+    pos = 0
+    for match in _FADE_IN.finditer(text):
+        if match.start() < pos:
+            continue
+        newline = text.find("\n", match.end())
+        if newline < 0:
+            # No later occurrence can reach a newline either
+            break
+        parts.append(text[pos : match.start()])
+        pos = newline + 1
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+def _iter_lines(text: str):
+    """Yield lines without materializing the whole split list."""
+    pos = 0
+    while pos <= len(text):
+        end = text.find("\n", pos)
+        if end < 0:
+            yield text[pos:]
+            return
+        yield text[pos:end]
+        pos = end + 1
 
 
 async def initialize_crew() -> None:
     """Initialize the screenplay writing crew with proper model and agents."""
-    global crew
+    global crew, repair_llm
 
     openai_api_key = os.getenv("OPENAI_API_KEY")
     openrouter_api_key = os.getenv("OPENROUTER_API_KEY")
@@ -155,8 +270,9 @@ async def initialize_crew() -> None:
                 model="gpt-4o",
                 api_key=openai_api_key,
                 temperature=0.7,
+                stream=True,
             )
-            print("✅ Using OpenAI GPT-4o directly")
+            logger.info("✅ Using OpenAI GPT-4o directly")
 
         elif openrouter_api_key:
             llm = LLM(
@@ -164,8 +280,9 @@ async def initialize_crew() -> None:
                 api_key=openrouter_api_key,
                 base_url="https://openrouter.ai/api/v1",
                 temperature=0.7,
+                stream=True,
             )
-            print(f"✅ Using OpenRouter via CrewAI LLM: {model_name}")
+            logger.info("✅ Using OpenRouter via CrewAI LLM: %s", model_name)
 
             if not os.getenv("OPENAI_API_KEY"):
                 os.environ["OPENAI_API_KEY"] = openrouter_api_key
@@ -178,9 +295,9 @@ async def initialize_crew() -> None:
             )
             raise ValueError(error_msg)  # noqa: TRY301
 
-    except Exception as e:
-        print(f"❌ LLM initialization error: {e}")
-        print("🔄 Trying alternative configuration...")
+    except Exception:
+        logger.exception("❌ LLM initialization error")
+        logger.info("🔄 Trying alternative configuration...")
 
         try:
             # SIMPLIFIED: Just use CrewAI LLM directly
@@ -192,20 +309,21 @@ async def initialize_crew() -> None:
                     api_key=openrouter_api_key,
                     base_url="https://openrouter.ai/api/v1",
                     temperature=0.7,
+                    stream=True,
                 )
-                print("✅ Using OpenRouter via CrewAI LLM (fallback)")
+                logger.info("✅ Using OpenRouter via CrewAI LLM (fallback)")
             else:
                 raise ValueError(ERROR_NO_API_KEY)  # noqa: TRY301
 
-        except Exception as fallback_error:
-            print(f"❌ Fallback also failed: {fallback_error}")
+        except Exception:
+            logger.exception("❌ Fallback also failed")
 
             class MockLLM:
                 def __call__(self, *args, **kwargs):
                     return "Mock response for testing"
 
             llm = MockLLM()
-            print("⚠️ Using mock LLM for testing only")
+            logger.warning("⚠️ Using mock LLM for testing only")
 
     # Define Agent - STRICT FORMATTER
     screenwriter = Agent(
@@ -282,7 +400,10 @@ async def initialize_crew() -> None:
         memory=False,
     )
 
-    print("✅ Screenplay Writing Crew initialized")
+    # Keep the LLM around for short per-scene repair calls
+    repair_llm = llm
+
+    logger.info("✅ Screenplay Writing Crew initialized")
 
 
 def enforce_screenplay_format(text: str) -> str:  # noqa: C901
@@ -293,18 +414,20 @@ def enforce_screenplay_format(text: str) -> str:  # noqa: C901
     # Start with FADE IN
     result_lines = ["FADE IN:", ""]
 
+    # Oversized model output is cut at a line boundary; every step below is linear
+    text = _truncate_at_line(text, MAX_FORMAT_INPUT_CHARS)
+
     # Remove any markdown
-    text = re.sub(r"```.*?```", "", text, flags=re.DOTALL)
+    text = _strip_code_fences(text)
 
     # Split into sentences/paragraphs
     content = text.strip()
 
     # Extract FADE IN if present
-    if "FADE IN" in content.upper():
-        content = re.sub(r"FADE IN.*?\n", "", content, flags=re.IGNORECASE)
+    content = _strip_fade_in(content)
 
     # Process each line
-    lines = content.split("\n")
+    lines = _iter_lines(content)
     current_scene = None
     in_dialogue = False
     current_character = ""
@@ -319,7 +442,7 @@ def enforce_screenplay_format(text: str) -> str:  # noqa: C901
             continue
 
         # Check for scene header
-        scene_match = re.match(
+        scene_match = len(line) <= MAX_SCENE_HEADER_CHARS and re.match(
             r"^(INT\.|EXT\.|INT/EXT\.)\s+(.+?)\s*-\s*(DAY|NIGHT|CONTINUOUS|LATER)",
             line.upper(),
         )
@@ -352,8 +475,7 @@ def enforce_screenplay_format(text: str) -> str:  # noqa: C901
 
         # Check for parenthetical
         if line.startswith("(") and line.endswith(")"):
-            parenthetical = " " * 15 + line
-            result_lines.append(parenthetical)
+            result_lines.extend(render_element(PARENTHETICAL, line))
             last_line_was_dialogue = False
             continue
 
@@ -365,8 +487,7 @@ def enforce_screenplay_format(text: str) -> str:  # noqa: C901
             if result_lines and dialogue in result_lines[-1]:
                 continue  # Skip duplicate
 
-            dialogue_formatted = " " * 10 + dialogue
-            result_lines.append(dialogue_formatted)
+            result_lines.extend(render_element(DIALOGUE, dialogue))
             result_lines.append("")
             in_dialogue = False
             current_character = ""
@@ -395,49 +516,252 @@ def enforce_screenplay_format(text: str) -> str:  # noqa: C901
     if not any("FADE OUT" in line.upper() for line in result_lines):
         result_lines.append("FADE OUT.")
 
-    # Join and clean
-    result = "\n".join(result_lines)
+    # Remove excessive blank lines, then join
+    cleaned: list[str] = []
+    for line in result_lines:
+        if not line.strip() and cleaned and not cleaned[-1].strip():
+            continue
+        cleaned.append(line)
+
+    return "\n".join(cleaned)
+
+
+async def _maybe_recycle_crew() -> None:
+    """Rebuild the crew when the worker crosses its memory or request budget."""
+    if memory_monitor.recycle_reason() is None:
+        return
+    # Whoever finds the lock taken skips: the crew is already being rebuilt
+    if not _recycle_lock.acquire(blocking=False):
+        return
+    try:
+        reason = memory_monitor.recycle_reason()
+        if reason is None:
+            return
+        # Requests in flight keep running on their own crew copies
+        await initialize_crew()
+        gc.collect()
+        memory_monitor.record_recycle(reason)
+    finally:
+        _recycle_lock.release()
+
+
+async def _repair_scene(prompt: str) -> str:
+    """Ask the LLM to rewrite a single badly formatted scene."""
+    return str(await asyncio.to_thread(repair_llm.call, prompt))
+
+
+def format_locally(input_text: str) -> str | None:
+    """Format input that is already a script or transcript, or return None if it needs the LLM."""
+    if not FAST_PATH_ENABLED:
+        return None
+    started = time.perf_counter()
+    draft = prepare_local_draft(input_text)
+    if draft is None:
+        return None
 
-    # Remove excessive blank lines
-    result = re.sub(r"\n\s*\n\s*\n+", "\n\n", result)
+    kind, text = draft
+    screenplay = enforce_screenplay_format(text)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    fast_path_stats.record_local(kind, elapsed_ms)
+    logger.info("⚡ Formatted %s input locally in %.1f ms; %s", kind, elapsed_ms, fast_path_stats.summary())
+    return screenplay
 
-    return result
+
+class StreamLoopAborted(BaseException):
+    """Unwinds a streaming LLM call from a crewai event handler once its output loops.
+
+    crewai swallows ``Exception`` raised by event handlers and its LLM clients catch
+    ``Exception`` around the stream, so only a BaseException stops the call.
+    """
+
+
+@crewai_event_bus.on(LLMStreamChunkEvent)
+def _watch_stream(source, event) -> None:
+    """Feed streamed tokens to the crew run in this thread and abort the call once they loop."""
+    detector = _stream_detector.get()
+    if detector is not None and detector.feed(event.chunk):
+        raise StreamLoopAborted
+
+
+def _kickoff(crew_copy: Crew, input_text: str) -> tuple[str, bool]:
+    """Run a crew copy in this thread; return its output and whether generation was stopped at a loop."""
+    detector = RepetitionDetector()
+    token = _stream_detector.set(detector)
+    try:
+        return str(crew_copy.kickoff(inputs={"input": input_text})), False
+    except StreamLoopAborted:
+        # The stream carries the agent's raw reply, before crewai parses out the final answer
+        text = detector.text()
+        return (text.partition(_FINAL_ANSWER)[2] or text).lstrip(), True
+    finally:
+        _stream_detector.reset(token)
 
 
 async def run_crew(input_text: str) -> str:
-    """Run the crew and get the screenplay."""
+    """Run the crew and get the screenplay; errors propagate to the caller."""
     global crew
 
+    screenplay = format_locally(input_text)
+    if screenplay is not None:
+        return screenplay
+
+    cached = prompt_cache.get(input_text)
+    if cached is not None:
+        logger.info("🎯 Prompt cache hit (similarity %.2f); %s", cached.similarity, prompt_cache.stats.summary())
+        return cached.value
+
     if not crew:
         raise RuntimeError(ERROR_CREW_NOT_INITIALIZED)
+    fast_path_stats.record_llm()
 
     try:
-        print(f"🎬 Running crew with input: {input_text}")
+        logger.info("🎬 Running crew", extra={"prompt": describe_prompt(input_text)})
+
+        # Run a copy of the crew off the event loop so concurrent requests and
+        # job workers neither block each other nor share task state
+        async with memory_monitor.track("run_crew"):
+            screenplay, stopped = await asyncio.to_thread(_kickoff, crew.copy(), input_text)
+        if stopped:
+            logger.warning("🛑 Stopped generation at a repetition loop: %d chars kept", len(screenplay))
 
-        # Run the crew
-        result = crew.kickoff(inputs={"input": input_text})
+        logger.debug("📊 Raw output: %d chars", len(screenplay))
 
-        # Get the text - CrewAI returns the result directly
-        screenplay = str(result)
+        # Models that do not stream return the whole reply; cut any loop down to a single copy
+        screenplay, looped = trim_repetition(screenplay)
+        if looped:
+            logger.warning("✂️  Removed repeated copies of a loop: %d chars kept", len(screenplay))
 
-        print(f"📊 Raw output: {len(screenplay)} chars")
+        # Send only badly formatted scenes back to the LLM instead of regenerating
+        if hasattr(repair_llm, "call"):
+            screenplay, repaired = await repair_screenplay(screenplay, _repair_scene, max_repairs=MAX_SCENE_REPAIRS)
+            if repaired:
+                logger.info("🩹 Repaired %d scene(s): %s", len(repaired), [report.issues for report in repaired])
 
         # Apply STRICT formatting enforcement
         screenplay = enforce_screenplay_format(screenplay)
 
-        print(f"📊 Formatted: {len(screenplay)} chars")
+        logger.debug("📊 Formatted: %d chars", len(screenplay))
 
-    except Exception as e:
-        error_msg = f"Crew execution failed: {e!s}"
-        print(f"❌ {error_msg}")
-        traceback.print_exc()
-        return "FADE IN:\n\nEXT. ERROR - NIGHT\n\nAn error occurred.\n\nFADE OUT."
-    else:
-        return screenplay
+    finally:
+        await _maybe_recycle_crew()
+        memory_monitor.maybe_report()
+
+    prompt_cache.put(input_text, screenplay)
+    return screenplay
+
+
+def create_job_queue() -> JobQueue:
+    """Open the persistent job store and build a stopped worker pool around run_crew."""
+    global job_queue
+
+    store = JobStore(os.getenv("JOB_STORE_PATH", DEFAULT_JOB_STORE_PATH))
+    job_queue = JobQueue(
+        store,
+        run_crew,
+        workers=int(os.getenv("JOB_WORKERS", str(DEFAULT_JOB_WORKERS))),
+        result_ttl_seconds=float(os.getenv("JOB_RESULT_TTL_SECONDS", str(DEFAULT_JOB_RESULT_TTL_SECONDS))),
+        max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", str(DEFAULT_JOB_MAX_ATTEMPTS))),
+    )
+    return job_queue
 
 
+async def initialize_job_queue() -> JobQueue:
+    """Start the worker pool on the current event loop if it was not started at server startup."""
+    queue = job_queue or create_job_queue()
+    await queue.start()
+    return queue
+
+
+def _parse_job_request(user_input: str) -> dict | None:
+    """Return the job request if the user input is a JSON job API call."""
+    if not user_input.startswith("{"):
+        return None
+    try:
+        request = json.loads(user_input)
+    except json.JSONDecodeError:
+        return None
+    if isinstance(request, dict) and request.get("action") in JOB_ACTIONS:
+        return request
+    return None
+
+
+async def handle_job_request(request: dict) -> str:
+    """Submit, poll or fetch an asynchronous screenplay job."""
+    queue = job_queue
+    if queue is None:
+        async with _init_lock:
+            queue = job_queue or await initialize_job_queue()
+
+    action = request["action"]
+    if action == "submit":
+        input_text = str(request.get("input", "")).strip()
+        if not input_text:
+            return json.dumps({"success": False, "error": "Please provide a story idea."})
+        if len(input_text) > MAX_INPUT_CHARS:
+            return json.dumps({"success": False, "error": f"Input too long: maximum {MAX_INPUT_CHARS} characters"})
+        try:
+            priority = int(request.get("priority", 0))
+        except (TypeError, ValueError):
+            return json.dumps({"success": False, "error": "priority must be an integer"})
+        job = queue.submit(input_text, priority)
+        logger.info("📥 Queued job %s (priority %d)", job.id, priority)
+        return json.dumps({"success": True, **job.to_dict()})
+
+    job = queue.store.get(str(request.get("job_id", "")))
+    if job is None:
+        return json.dumps({"success": False, "error": ERROR_JOB_NOT_FOUND})
+    response = {"success": True, **job.to_dict(include_result=action == "result")}
+    if job.result is None:
+        return json.dumps(response)
+
+    page_index = _job_page_index(job.id, job.result)
+    response["page_count"] = page_index.page_count
+    if action == "result" and request.get("pages"):
+        try:
+            response["result"], response["pages"] = _select_pages(page_index, request["pages"])
+        except PageRangeError as e:
+            return json.dumps({"success": False, "error": str(e)})
+    return json.dumps(response)
+
+
+def _select_pages(page_index: PageIndex, spec: str) -> tuple[str, str]:
+    """Return the text and "start-end" label of the requested pages, clamped to the last page."""
+    start, end = parse_page_range(spec)
+    if start > page_index.page_count:
+        raise PageRangeError(spec, page_index.page_count)
+    end = min(end, page_index.page_count)
+    return page_index.pages(start, end), f"{start}-{end}"
+
+
+def _job_page_index(job_id: str, screenplay: str) -> PageIndex:
+    """Lay out a finished job once and reuse its page index for later lookups."""
+    page_index = _page_indexes.pop(job_id, None) or paginate(screenplay)
+    _page_indexes[job_id] = page_index
+    while len(_page_indexes) > PAGE_INDEX_CACHE_SIZE:
+        _page_indexes.pop(next(iter(_page_indexes)))
+    return page_index
+
+
+@profiler.profile
 async def handler(messages: list[dict[str, str]]) -> str:
     """Handle incoming agent messages."""
+    # Every log line of this request, including from worker threads, carries one request id
+    with request_context():
+        return await _handle_messages(messages)
+
+
+async def _initialize() -> None:
+    """Finish start-up on the server's event loop."""
+    logger.info("🔧 Initializing Screenplay Writing Crew...")
+    profiler.watch_loop(asyncio.get_running_loop())
+    # main() builds the crew and starts the job workers before serving
+    if crew is None:
+        await initialize_crew()
+    if job_queue is None or not job_queue.running:
+        await initialize_job_queue()
+
+
+async def _handle_messages(messages: list[dict[str, str]]) -> str:
     global _initialized
 
     # Type checking for messages
@@ -447,8 +771,7 @@ async def handler(messages: list[dict[str, str]]) -> str:
     # Lazy initialization
     async with _init_lock:
         if not _initialized:
-            print("🔧 Initializing Screenplay Writing Crew...")
-            await initialize_crew()
+            await _initialize()
             _initialized = True
 
     # Extract user input
@@ -461,29 +784,46 @@ async def handler(messages: list[dict[str, str]]) -> str:
     if not user_input:
         return "FADE IN:\n\nEXT. OFFICE - DAY\n\nPlease provide a story idea.\n\nFADE OUT."
 
-    print(f"✅ Processing: {user_input}")
+    job_request = _parse_job_request(user_input)
+    if job_request is not None:
+        return await handle_job_request(job_request)
+
+    if len(user_input) > MAX_INPUT_CHARS:
+        logger.warning("⚠️  Rejected input of %d chars (limit %d)", len(user_input), MAX_INPUT_CHARS)
+        return (
+            "FADE IN:\n\nEXT. ERROR - DAY\n\n"
+            f"Input too long: {len(user_input)} characters (maximum {MAX_INPUT_CHARS}).\n\nFADE OUT."
+        )
+
+    logger.info("✅ Processing request", extra={"prompt": describe_prompt(user_input)})
 
     try:
         screenplay = await run_crew(user_input)
 
         if screenplay:
-            print("✅ Success! Generated screenplay")
+            logger.info("✅ Success! Generated screenplay")
             return screenplay
         else:
             return "FADE IN:\n\nEXT. OFFICE - DAY\n\nNo screenplay generated.\n\nFADE OUT."
 
     except Exception as e:
         error_msg = f"Handler error: {e!s}"
-        print(f"❌ {error_msg}")
+        logger.exception("❌ %s", error_msg)
         return f"FADE IN:\n\nEXT. ERROR - NIGHT\n\n{error_msg}\n\nFADE OUT."
 
 
 async def cleanup() -> None:
     """Clean up resources."""
-    global crew
-    print("🧹 Cleaning up...")
+    global crew, job_queue
+    logger.info("🧹 Cleaning up...")
+    profiler.stop()
+    if job_queue:
+        await job_queue.stop()
+        job_queue.store.close()
+        job_queue = None
     crew = None
-    print("✅ Cleanup complete")
+    logger.info("✅ Cleanup complete")
+    shutdown_logging()
 
 
 def main() -> None:
@@ -522,7 +862,13 @@ def main() -> None:
     print("🤖 Screenplay Writer Agent")
     print("📝 Generates perfectly formatted screenplays")
 
+    setup_logging()
     config = load_config()
+    profiler.start()
+
+    # Start the job workers now so queued and interrupted jobs resume without waiting for a request
+    asyncio.run(initialize_crew())
+    create_job_queue().start_in_thread()
 
     try:
         print("🚀 Starting server...")
@@ -0,0 +1,220 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Memory accounting for long-running workers: sampled tracemalloc, RSS budget and crew recycling."""
+
+import asyncio
+import os
+import random
+import resource
+import sys
+import sysconfig
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+from screenplay_writer_agent.log import get_logger
+
+logger = get_logger("memory")
+
+RECYCLE_REASON_RSS = "rss_budget"
+RECYCLE_REASON_REQUESTS = "max_requests"
+
+_TRACE_FRAMES = 10
+_STDLIB = sysconfig.get_paths()["stdlib"]
+
+
+def current_rss_bytes() -> int:
+    """Return the resident set size of this process."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Not Linux: fall back to the peak RSS, reported in KiB (bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class MemoryConfig:
+    """Memory budget settings, read from environment variables."""
+
+    trace_sample_rate: float = 0.0
+    budget_mb: float = 0.0
+    crew_max_requests: int = 0
+    recycle_cooldown_seconds: float = 60.0
+    report_interval_seconds: float = 600.0
+    top_n: int = 10
+
+    @classmethod
+    def from_env(cls) -> "MemoryConfig":
+        """Build the configuration from environment variables."""
+        return cls(
+            trace_sample_rate=float(os.getenv("MEMORY_TRACE_SAMPLE_RATE", "0")),
+            budget_mb=float(os.getenv("MEMORY_BUDGET_MB", "0")),
+            crew_max_requests=int(os.getenv("CREW_MAX_REQUESTS", "0")),
+            recycle_cooldown_seconds=float(os.getenv("CREW_RECYCLE_COOLDOWN_SECONDS", "60")),
+            report_interval_seconds=float(os.getenv("MEMORY_REPORT_INTERVAL_SECONDS", "600")),
+            top_n=int(os.getenv("MEMORY_REPORT_TOP_N", "10")),
+        )
+
+
+@dataclass
+class RecycleEvent:
+    """A recorded crew recycle."""
+
+    timestamp: float
+    reason: str
+    rss_mb: float
+    requests: int
+
+
+@dataclass
+class MemoryStats:
+    """Aggregated allocation data across traced requests."""
+
+    traced_requests: int = 0
+    net_bytes: int = 0
+    sites: Counter = field(default_factory=Counter)
+
+
+class MemoryMonitor:
+    """Tracks per-request allocations and decides when the crew should be recycled."""
+
+    def __init__(self, config: MemoryConfig | None = None) -> None:
+        """Create a monitor with the given budget settings."""
+        self.config = config or MemoryConfig()
+        self.stats = MemoryStats()
+        self.events: deque[RecycleEvent] = deque(maxlen=100)
+        self.requests_since_recycle = 0
+        # Requests in flight, and whether another one overlapped the traced request
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._overlapped = False
+        self._last_report = time.monotonic()
+        self._last_recycle: float | None = None
+
+    @asynccontextmanager
+    async def track(self, label: str = "request") -> AsyncIterator[None]:
+        """Count a request and, if sampled, trace its allocations with tracemalloc.
+
+        tracemalloc sees every allocation in the process, not just this
+        request's, so a request is only traced when it is the only one in
+        flight, and the trace is discarded if another request starts before it
+        ends. Tracing is also left alone if something else already started it.
+        Snapshots are taken and compared off the event loop.
+        """
+        with self._lock:
+            self.requests_since_recycle += 1
+            self._in_flight += 1
+            self._overlapped = True
+            traced = (
+                self._in_flight == 1
+                and random.random() < self.config.trace_sample_rate  # noqa: S311
+                and not tracemalloc.is_tracing()
+            )
+            if traced:
+                self._overlapped = False
+                tracemalloc.start(_TRACE_FRAMES)
+        try:
+            if not traced:
+                yield
+                return
+            before = None
+            try:
+                before = await asyncio.to_thread(tracemalloc.take_snapshot)
+                yield
+            finally:
+                diffs = await asyncio.to_thread(_finish_trace, before)
+            if self._overlapped:
+                logger.debug("🧠 %s: trace discarded, another request ran alongside it", label)
+            elif before is not None:
+                self._record(diffs, label)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _record(self, diffs: list[tracemalloc.StatisticDiff], label: str) -> None:
+        self.stats.traced_requests += 1
+        net = 0
+        for diff in diffs:
+            net += diff.size_diff
+            if diff.size_diff > 0:
+                self.stats.sites[_call_site(diff.traceback)] += diff.size_diff
+        self.stats.net_bytes += net
+        logger.info("🧠 %s: %+.1f KiB net allocations", label, net / 1024)
+
+    def recycle_reason(self) -> str | None:
+        """Return why the crew should be recycled now, or None."""
+        # Memory held outside the crew survives a recycle, so don't rebuild it on every request
+        cooling_down = (
+            self._last_recycle is not None
+            and time.monotonic() - self._last_recycle < self.config.recycle_cooldown_seconds
+        )
+        if self.config.budget_mb and not cooling_down and current_rss_bytes() > self.config.budget_mb * 1024 * 1024:
+            return RECYCLE_REASON_RSS
+        if self.config.crew_max_requests and self.requests_since_recycle >= self.config.crew_max_requests:
+            return RECYCLE_REASON_REQUESTS
+        return None
+
+    def record_recycle(self, reason: str) -> RecycleEvent:
+        """Record a crew recycle and reset the per-crew request count."""
+        event = RecycleEvent(
+            timestamp=time.time(),
+            reason=reason,
+            rss_mb=round(current_rss_bytes() / 1024 / 1024, 1),
+            requests=self.requests_since_recycle,
+        )
+        self.events.append(event)
+        self.requests_since_recycle = 0
+        self._last_recycle = time.monotonic()
+        logger.warning("♻️  Recycled crew (%s) after %d request(s), RSS %s MB", reason, event.requests, event.rss_mb)
+        return event
+
+    def report(self) -> str:
+        """Return a report of RSS, recycles and the top allocating call sites."""
+        lines = [
+            f"RSS: {current_rss_bytes() / 1024 / 1024:.1f} MB"
+            + (f" (budget {self.config.budget_mb:.0f} MB)" if self.config.budget_mb else ""),
+            f"Crew recycles: {len(self.events)}; requests on current crew: {self.requests_since_recycle}",
+            f"Traced requests: {self.stats.traced_requests}; net allocations: {self.stats.net_bytes / 1024:.1f} KiB",
+        ]
+        for site, size in self.stats.sites.most_common(self.config.top_n):
+            lines.append(f"  {size / 1024:10.1f} KiB  {site}")
+        return "\n".join(lines)
+
+    def maybe_report(self) -> str | None:
+        """Log the report if the reporting interval has elapsed."""
+        if time.monotonic() - self._last_report < self.config.report_interval_seconds:
+            return None
+        self._last_report = time.monotonic()
+        report = self.report()
+        logger.info("🧠 Memory report\n%s", report)
+        return report
+
+
+def _finish_trace(before: tracemalloc.Snapshot | None) -> list[tracemalloc.StatisticDiff]:
+    """Stop tracing and diff the allocations made since ``before``."""
+    after = tracemalloc.take_snapshot() if before is not None else None
+    tracemalloc.stop()
+    return after.compare_to(before, "traceback") if after is not None else []
+
+
+def _call_site(traceback: tracemalloc.Traceback) -> str:
+    """Return the innermost frame outside the standard library, if any."""
+    frames = list(traceback)
+    for frame in reversed(frames):
+        if "site-packages" in frame.filename or not frame.filename.startswith(_STDLIB):
+            return f"{frame.filename}:{frame.lineno}"
+    frame = frames[-1]
+    return f"{frame.filename}:{frame.lineno}"
@@ -0,0 +1,275 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Opt-in profiling for live workers: sampled cProfile, stack sampling and slow-loop detection."""
+
+import asyncio
+import cProfile
+import functools
+import os
+import random
+import signal
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from types import FrameType
+
+from screenplay_writer_agent.common import env_flag
+from screenplay_writer_agent.log import get_logger
+
+logger = get_logger("profiling")
+
+
+@dataclass
+class ProfilingConfig:
+    """Profiling settings, read from PROFILE_* environment variables."""
+
+    enabled: bool = False
+    sample_rate: float = 0.01
+    directory: str = "profiles"
+    max_disk_mb: float = 100.0
+    window_seconds: float = 60.0
+    sample_interval_ms: float = 10.0
+    slow_callback_ms: float = 100.0
+
+    @classmethod
+    def from_env(cls) -> "ProfilingConfig":
+        """Build the configuration from environment variables."""
+        return cls(
+            enabled=env_flag("PROFILING_ENABLED"),
+            sample_rate=float(os.getenv("PROFILE_SAMPLE_RATE", "0.01")),
+            directory=os.getenv("PROFILE_DIR", "profiles"),
+            max_disk_mb=float(os.getenv("PROFILE_MAX_DISK_MB", "100")),
+            window_seconds=float(os.getenv("PROFILE_WINDOW_SECONDS", "60")),
+            sample_interval_ms=float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "10")),
+            slow_callback_ms=float(os.getenv("SLOW_CALLBACK_MS", "100")),
+        )
+
+
+def collapse_stack(frame: FrameType | None, thread_name: str) -> str:
+    """Render a frame chain root-first in flamegraph "collapsed" form."""
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(f"{Path(code.co_filename).stem}:{code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    frames.append(thread_name)
+    return ";".join(reversed(frames))
+
+
+class StackSampler(threading.Thread):
+    """Background thread keeping a rolling window of sampled stacks for every thread."""
+
+    def __init__(self, interval: float, window_seconds: float) -> None:
+        """Sample every ``interval`` seconds, keeping the last ``window_seconds`` of stacks."""
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.window_seconds = window_seconds
+        self._samples: deque[tuple[float, str]] = deque()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        """Sample all threads until stopped."""
+        own_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            now = time.monotonic()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            stacks = [
+                collapse_stack(frame, names.get(thread_id, str(thread_id)))
+                for thread_id, frame in sys._current_frames().items()
+                if thread_id != own_id
+            ]
+            with self._lock:
+                self._samples.extend((now, stack) for stack in stacks)
+                cutoff = now - self.window_seconds
+                while self._samples and self._samples[0][0] < cutoff:
+                    self._samples.popleft()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        self._stop_event.set()
+
+    def collapsed(self, seconds: float | None = None) -> str:
+        """Return aggregated collapsed stacks for the last ``seconds`` of samples."""
+        cutoff = time.monotonic() - (seconds if seconds is not None else self.window_seconds)
+        with self._lock:
+            counts = Counter(stack for timestamp, stack in self._samples if timestamp >= cutoff)
+        return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+
+class LoopWatchdog(threading.Thread):
+    """Detect event loop stalls and capture the loop thread's stack while it is blocked.
+
+    asyncio's own debug mode only reports slow callbacks after they finish. The
+    watchdog samples the blocked frame itself, so the report names the coroutine
+    and line that held the loop, e.g. a synchronous ``crew.kickoff``.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, threshold: float, on_stall: Callable[[str], None]) -> None:
+        """Watch ``loop``, which must be running on the calling thread, for stalls over ``threshold`` seconds."""
+        super().__init__(name="loop-watchdog", daemon=True)
+        self.loop = loop
+        self.threshold = threshold
+        self.on_stall = on_stall
+        self.loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop_event = threading.Event()
+
+    def _beat(self) -> None:
+        self._last_beat = time.monotonic()
+
+    def run(self) -> None:
+        """Ping the loop and report when it stops answering."""
+        reported = False
+        while not self._stop_event.wait(self.threshold / 2):
+            if self.loop.is_closed():
+                return
+            lag = time.monotonic() - self._last_beat
+            if lag > self.threshold:
+                if not reported:
+                    frame = sys._current_frames().get(self.loop_thread_id)
+                    stack = "".join(traceback.format_stack(frame)) if frame else "<no frame>"
+                    self.on_stall(f"Event loop blocked for {lag * 1000:.0f} ms at:\n{stack}")
+                    reported = True
+                continue
+            reported = False
+            try:
+                self.loop.call_soon_threadsafe(self._beat)
+            except RuntimeError:
+                return
+
+    def stop(self) -> None:
+        """Stop watching the loop."""
+        self._stop_event.set()
+
+
+class Profiler:
+    """Entry point for opt-in profiling of a running worker."""
+
+    def __init__(self, config: ProfilingConfig | None = None) -> None:
+        """Create an idle profiler; nothing runs until start() unless profiling is enabled."""
+        self.config = config or ProfilingConfig()
+        self.directory = Path(self.config.directory)
+        self.sampler: StackSampler | None = None
+        self.watchdog: LoopWatchdog | None = None
+        self.stalls: deque[str] = deque(maxlen=50)
+        self._profiling = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether profiling was opted into."""
+        return self.config.enabled
+
+    def start(self) -> None:
+        """Start the stack sampler and install the SIGUSR1 dump handler."""
+        if not self.enabled or self.sampler is not None:
+            return
+        self.sampler = StackSampler(self.config.sample_interval_ms / 1000, self.config.window_seconds)
+        self.sampler.start()
+        if hasattr(signal, "SIGUSR1") and threading.current_thread() is threading.main_thread():
+            # The handler runs on the main thread, which may be the event loop's; write from another thread
+            signal.signal(
+                signal.SIGUSR1,
+                lambda signum, frame: threading.Thread(target=self.dump_stacks, name="profile-dump").start(),
+            )
+        logger.info("🔬 Profiling enabled, dumps go to %s/ (kill -USR1 %d to dump)", self.directory, os.getpid())
+
+    def watch_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start slow-callback detection for ``loop``; must be called from the loop thread."""
+        if not self.enabled or self.watchdog is not None:
+            return
+        self.watchdog = LoopWatchdog(loop, self.config.slow_callback_ms / 1000, self._record_stall)
+        self.watchdog.start()
+
+    def stop(self) -> None:
+        """Stop background threads."""
+        if self.sampler:
+            self.sampler.stop()
+            self.sampler = None
+        if self.watchdog:
+            self.watchdog.stop()
+            self.watchdog = None
+
+    def _record_stall(self, report: str) -> None:
+        self.stalls.append(report)
+        logger.warning("🐢 %s", report)
+        self._write("stall", "txt", report)
+
+    def dump_stacks(self, seconds: float | None = None) -> Path | None:
+        """Write flamegraph-ready collapsed stacks for the last ``seconds``."""
+        if self.sampler is None:
+            return None
+        return self._write("stacks", "collapsed", self.sampler.collapsed(seconds))
+
+    def profile(self, func: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+        """Decorate a coroutine function so a sampled fraction of calls runs under cProfile.
+
+        cProfile is per thread, so a dump also contains whatever other coroutines
+        ran on the loop meanwhile. Only one call is profiled at a time.
+        """
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if (
+                not self.enabled
+                or random.random() >= self.config.sample_rate  # noqa: S311
+                or not self._profiling.acquire(blocking=False)
+            ):
+                return await func(*args, **kwargs)
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler (e.g. a debugger) already owns this thread
+                self._profiling.release()
+                return await func(*args, **kwargs)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                profile.disable()
+                self._profiling.release()
+                # Keep file writes off the event loop
+                await asyncio.to_thread(self._dump_profile, profile, func.__name__)
+
+        return wrapper
+
+    def _dump_profile(self, profile: cProfile.Profile, name: str) -> None:
+        profile.dump_stats(self._reserve_path(name, "prof"))
+        self._enforce_disk_budget()
+
+    def _reserve_path(self, kind: str, suffix: str) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return self.directory / f"{kind}-{stamp}-{os.getpid()}-{time.monotonic_ns() % 1_000_000}.{suffix}"
+
+    def _write(self, kind: str, suffix: str, content: str) -> Path:
+        path = self._reserve_path(kind, suffix)
+        path.write_text(content)
+        self._enforce_disk_budget()
+        return path
+
+    def _enforce_disk_budget(self) -> None:
+        """Delete the oldest dumps until the directory fits in the disk budget."""
+        budget = self.config.max_disk_mb * 1024 * 1024
+        files = sorted(
+            (path for path in self.directory.iterdir() if path.is_file()),
+            key=lambda path: path.stat().st_mtime,
+        )
+        total = sum(path.stat().st_size for path in files)
+        for path in files[:-1]:
+            if total <= budget:
+                break
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
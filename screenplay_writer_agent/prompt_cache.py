@@ -0,0 +1,372 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Near-duplicate prompt cache: MinHash signatures over prompt shingles, indexed with LSH bands."""
+
+import itertools
+import os
+import random
+import re
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import blake2b
+
+from screenplay_writer_agent.common import env_flag
+
+_SEED = 0x5C12EE
+
+# Letters and digits in any script. Chinese and Japanese are written without spaces, so each of
+# their characters is a word of its own and adjacent pairs become character bigrams.
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+_WORD = re.compile(rf"[{_CJK}]|(?:[^\W_{_CJK}]|')+")
+
+# Spellings folded together before shingling
+_SYNONYMS = (
+    (re.compile(r"\brom[- ]?coms?\b"), "romantic comedy"),
+    (re.compile(r"\bsci[- ]?fi\b"), "science fiction"),
+    (re.compile(r"\bscripts?\b"), "screenplay"),
+    (re.compile(r"\bint\.?/ext\.?"), "interior exterior"),
+    (re.compile(r"\bint\.?(?=\s)"), "interior"),
+    (re.compile(r"\bext\.?(?=\s)"), "exterior"),
+)
+
+# Request boilerplate and function words that say nothing about the screenplay asked for. Pronouns
+# for characters (he, her, they) and length or format words (short, scene, screenplay) are kept,
+# since "his partner" and "her partner" or a scene and a short scene are different requests.
+# fmt: off
+_STOPWORDS = frozenset({
+    "a", "an", "the", "and", "or", "but", "of", "to", "in", "on", "at", "for", "with", "between", "about",
+    "from", "into", "onto", "by", "as", "than", "then", "so", "just", "very", "is", "are", "was", "were", "be",
+    "been", "being", "am", "do", "does", "did", "has", "have", "had", "it", "its", "this", "that", "these",
+    "those", "there", "who", "whom", "which", "what", "where", "when", "while", "some", "me", "my", "i", "we",
+    "our", "you", "your", "please", "can", "could", "would", "will", "should", "write", "create", "make",
+    "give", "generate", "draft",
+})
+# fmt: on
+
+_NUMBERS = dict(enumerate(["zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten"]))
+
+ERROR_BANDS = "PROMPT_CACHE_NUM_PERM must be a multiple of PROMPT_CACHE_BANDS"
+
+# Prompts with fewer shingles than this are never cached
+MIN_SHINGLES = 2
+
+
+def _stem(word: str) -> str:
+    """Strip common English inflections so "argue", "argues" and "arguing" meet."""
+    for suffix, min_length in (("ing", 6), ("ed", 5), ("es", 5), ("s", 4)):
+        if word.endswith(suffix) and len(word) >= min_length and not word.endswith("ss"):
+            word = word[: -len(suffix)]
+            break
+    return word[:-1] if word.endswith("e") and len(word) > 4 else word
+
+
+def normalize(text: str) -> list[str]:
+    """Lowercase, fold synonyms and numbers, drop boilerplate words and stem."""
+    text = text.lower()
+    for pattern, replacement in _SYNONYMS:
+        text = pattern.sub(replacement, text)
+    words = []
+    for word in _WORD.findall(text):
+        word = word.strip("'")
+        if word.isdigit() and int(word) in _NUMBERS:
+            word = _NUMBERS[int(word)]
+        if word and word not in _STOPWORDS:
+            words.append(_stem(word))
+    return words
+
+
+def shingles(text: str) -> set[int]:
+    """Hash the normalized words and adjacent word pairs of a prompt."""
+    words = normalize(text)
+    grams = words + [f"{first} {second}" for first, second in itertools.pairwise(words)]
+    # A fixed hash (unlike salted str hashes) keeps matches reproducible across restarts
+    return {int.from_bytes(blake2b(gram.encode(), digest_size=8).digest(), "little") for gram in grams}
+
+
+def jaccard(first: set[int], second: set[int] | array) -> float:
+    """Exact Jaccard similarity of two shingle sets."""
+    common = sum(1 for item in second if item in first)
+    union = len(first) + len(second) - common
+    return common / union if union else 0.0
+
+
+class MinHasher:
+    """MinHash signatures by one-permutation hashing with optimal densification.
+
+    Each shingle is hashed once and lands in one of ``num_perm`` bins, keeping
+    the minimum per bin, so signing costs O(shingles + num_perm) rather than
+    O(shingles * num_perm). Short prompts leave bins empty; each empty bin
+    copies the first occupied bin along its own fixed random probe order, which
+    keeps the bins of a band close to independent (Shrivastava, ICML 2017).
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = _SEED) -> None:
+        """Draw the per-bin probe orders for ``num_perm`` bins from ``seed``."""
+        rng = random.Random(seed)  # noqa: S311
+        self.num_perm = num_perm
+        self._probes = [rng.sample(range(num_perm), num_perm) for _ in range(num_perm)]
+
+    def signature(self, hashes: set[int]) -> list[int]:
+        """Return the signature of a non-empty set of 64-bit shingle hashes."""
+        bins: list[int | None] = [None] * self.num_perm
+        for h in hashes:
+            value, slot = divmod(h, self.num_perm)
+            current = bins[slot]
+            if current is None or value < current:
+                bins[slot] = value
+
+        signed = list(bins)
+        for slot, value in enumerate(bins):
+            if value is None:
+                for probe in self._probes[slot]:
+                    if bins[probe] is not None:
+                        signed[slot] = bins[probe]
+                        break
+        return signed
+
+
+@dataclass
+class PromptCacheConfig:
+    """Prompt cache settings, read from PROMPT_CACHE_* environment variables."""
+
+    enabled: bool = False
+    threshold: float = 0.8
+    max_entries: int = 10_000
+    ttl_seconds: float = 24 * 60 * 60
+    num_perm: int = 64
+    bands: int = 16
+
+    @classmethod
+    def from_env(cls) -> "PromptCacheConfig":
+        """Build the configuration from environment variables."""
+        return cls(
+            enabled=env_flag("PROMPT_CACHE_ENABLED"),
+            threshold=float(os.getenv("PROMPT_CACHE_THRESHOLD", "0.8")),
+            max_entries=int(os.getenv("PROMPT_CACHE_MAX_ENTRIES", "10000")),
+            ttl_seconds=float(os.getenv("PROMPT_CACHE_TTL_SECONDS", "86400")),
+            num_perm=int(os.getenv("PROMPT_CACHE_NUM_PERM", "64")),
+            bands=int(os.getenv("PROMPT_CACHE_BANDS", "16")),
+        )
+
+
+@dataclass
+class CacheHit:
+    """A cached response and how similar its prompt was to the lookup."""
+
+    value: str
+    similarity: float
+
+
+@dataclass
+class _Entry:
+    shingles: array
+    band_keys: tuple[int, ...]
+    value: str
+    expires_at: float
+
+
+@dataclass
+class PromptCacheStats:
+    """Lookup counters for logs."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self) -> str:
+        """One-line summary for logs."""
+        return f"{self.hits}/{self.hits + self.misses} lookups ({self.hit_rate:.0%}) hit, {self.evictions} evicted"
+
+
+class PromptCache:
+    """Approximate cache keyed by prompt similarity.
+
+    Prompts are split into bands of MinHash rows; any shared band makes an
+    entry a candidate, and candidates are confirmed with the exact Jaccard
+    similarity of their shingles, so the threshold is never just estimated.
+    Lookups touch only the matching buckets, so their cost does not grow with
+    the number of entries. Safe to share between the server and job worker
+    threads.
+    """
+
+    def __init__(self, config: PromptCacheConfig | None = None) -> None:
+        """Create an empty cache; it stores nothing unless ``config.enabled``."""
+        self.config = config or PromptCacheConfig()
+        if self.config.num_perm % self.config.bands:
+            raise ValueError(ERROR_BANDS)
+        self.rows = self.config.num_perm // self.config.bands
+        self.hasher = MinHasher(self.config.num_perm)
+        self.stats = PromptCacheStats()
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._buckets: list[dict[int, int | set[int]]] = [{} for _ in range(self.config.bands)]
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache was opted into."""
+        return self.config.enabled
+
+    def __len__(self) -> int:
+        """Return the number of cached entries, including expired ones not yet evicted."""
+        return len(self._entries)
+
+    def _band_keys(self, hashes: set[int]) -> tuple[int, ...]:
+        # Group consecutive signature slots into bands of ``rows`` and key each band by its hash
+        slots = iter(self.hasher.signature(hashes))
+        return tuple(map(hash, zip(*[slots] * self.rows, strict=True)))
+
+    def get(self, prompt: str) -> CacheHit | None:
+        """Return the response cached for the most similar prompt at or above the threshold."""
+        if not self.enabled:
+            return None
+        hashes = shingles(prompt)
+        with self._lock:
+            hit = self._lookup(hashes) if len(hashes) >= MIN_SHINGLES else None
+            if hit is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+        return hit
+
+    def put(self, prompt: str, value: str, ttl_seconds: float | None = None) -> bool:
+        """Cache a response; returns False if the prompt is too short to match reliably."""
+        if not self.enabled:
+            return False
+        hashes = shingles(prompt)
+        if len(hashes) < MIN_SHINGLES:
+            return False
+        with self._lock:
+            self._add(hashes, value, self.config.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        return True
+
+    def _lookup(self, hashes: set[int]) -> CacheHit | None:
+        candidates: set[int] = set()
+        for bucket, key in zip(self._buckets, self._band_keys(hashes), strict=True):
+            members = bucket.get(key)
+            if isinstance(members, int):
+                candidates.add(members)
+            elif members:
+                candidates.update(members)
+
+        now = time.monotonic()
+        best_id, best_similarity = None, 0.0
+        for entry_id in candidates:
+            entry = self._entries[entry_id]
+            if entry.expires_at <= now:
+                self._remove(entry_id)
+                self.stats.evictions += 1
+                continue
+            similarity = jaccard(hashes, entry.shingles)
+            if similarity >= self.config.threshold and similarity > best_similarity:
+                best_id, best_similarity = entry_id, similarity
+
+        if best_id is None:
+            return None
+        self._entries.move_to_end(best_id)
+        return CacheHit(self._entries[best_id].value, best_similarity)
+
+    def _add(self, hashes: set[int], value: str, ttl_seconds: float) -> None:
+        entry_id = self._next_id
+        self._next_id += 1
+        entry = _Entry(array("Q", hashes), self._band_keys(hashes), value, time.monotonic() + ttl_seconds)
+        self._entries[entry_id] = entry
+        for bucket, key in zip(self._buckets, entry.band_keys, strict=True):
+            # Most buckets hold a single entry; only collisions pay for a set
+            members = bucket.get(key)
+            if members is None:
+                bucket[key] = entry_id
+            elif isinstance(members, int):
+                bucket[key] = {members, entry_id}
+            else:
+                members.add(entry_id)
+
+        # Least recently used entries go first
+        while len(self._entries) > self.config.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id)
+        for bucket, key in zip(self._buckets, entry.band_keys, strict=True):
+            members = bucket[key]
+            if isinstance(members, int):
+                del bucket[key]
+            else:
+                members.discard(entry_id)
+                if len(members) == 1:
+                    bucket[key] = members.pop()
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            for bucket in self._buckets:
+                bucket.clear()
+
+
+@dataclass
+class ReplayReport:
+    """Outcome of replaying a labelled prompt log through a cache."""
+
+    lookups: int = 0
+    hits: int = 0
+    false_matches: int = 0
+    repeats: int = 0
+    lookup_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of repeated intents answered from the cache."""
+        return (self.hits - self.false_matches) / self.repeats if self.repeats else 0.0
+
+    @property
+    def false_match_rate(self) -> float:
+        """Share of all lookups answered with another intent's response."""
+        return self.false_matches / self.lookups if self.lookups else 0.0
+
+    @property
+    def mean_lookup_us(self) -> float:
+        """Average lookup latency in microseconds."""
+        return self.lookup_seconds / self.lookups * 1e6 if self.lookups else 0.0
+
+
+def replay(log: list[tuple[str, str]], config: PromptCacheConfig | None = None) -> ReplayReport:
+    """Replay (prompt, intent label) pairs in order, caching each miss under its label.
+
+    A hit is correct when it returns the response of a prompt with the same
+    label; a repeat is any prompt whose label was seen before.
+    """
+    config = config or PromptCacheConfig(enabled=True)
+    cache = PromptCache(config)
+    report = ReplayReport()
+    seen: set[str] = set()
+    for prompt, label in log:
+        started = time.perf_counter()
+        hit = cache.get(prompt)
+        report.lookup_seconds += time.perf_counter() - started
+        report.lookups += 1
+        report.repeats += label in seen
+        seen.add(label)
+        if hit is None:
+            cache.put(prompt, label)
+            continue
+        report.hits += 1
+        report.false_matches += hit.value != label
+    return report
@@ -0,0 +1,160 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Detect runaway repetition in screenplay output and cut the loop back to one copy."""
+
+import hashlib
+import re
+
+from screenplay_writer_agent.common import BLOCK_SEPARATOR
+
+# A loop is reported once the same run of blocks has appeared this many times in a row...
+DEFAULT_MIN_REPEATS = 3
+# ...and the repeated copies cover at least this many characters
+DEFAULT_MIN_LOOP_CHARS = 200
+# Longest run of blocks (scenes, dialogue exchanges) considered as a repeating unit
+DEFAULT_MAX_PERIOD = 32
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _fingerprint(block: str) -> bytes:
+    """Hash a block with whitespace and case normalized."""
+    normalized = _WHITESPACE.sub(" ", block).strip().lower()
+    return hashlib.blake2b(normalized.encode(), digest_size=8).digest()
+
+
+class RepetitionDetector:
+    """Incrementally detect a repeating tail of blank-line separated blocks.
+
+    Each completed block is fingerprinted. For every candidate period ``p`` the
+    detector keeps the length of the current run where block ``i`` equals block
+    ``i - p``, so each new block costs ``O(max_period)`` and a whole stream is
+    processed in linear time.
+
+    Once a loop is found, later blocks only extend it while they keep
+    repeating; text after the loop is kept, and only the first loop is cut.
+    """
+
+    def __init__(
+        self,
+        min_repeats: int = DEFAULT_MIN_REPEATS,
+        min_loop_chars: int = DEFAULT_MIN_LOOP_CHARS,
+        max_period: int = DEFAULT_MAX_PERIOD,
+    ) -> None:
+        """Report a loop once ``min_repeats`` copies of up to ``max_period`` blocks span ``min_loop_chars``."""
+        self.min_repeats = max(2, min_repeats)
+        self.min_loop_chars = min_loop_chars
+        self.max_period = max(1, max_period)
+        self._text: list[str] = []
+        self._pending_start = 0
+        self._pending = ""
+        self._hashes: list[bytes] = []
+        self._ends: list[int] = []
+        self._sizes: list[int] = [0]
+        self._runs = [0] * (self.max_period + 1)
+        self.loop_end: int | None = None
+        self._loop_period = 0
+        self._repeat_end = 0
+        self._repeating = False
+
+    @property
+    def detected(self) -> bool:
+        """Whether a loop above the threshold has been seen."""
+        return self.loop_end is not None
+
+    def feed(self, chunk: str) -> bool:
+        """Consume a streamed chunk; return True once a loop has been detected."""
+        if not chunk:
+            return self.detected
+        self._text.append(chunk)
+        # A separator can straddle chunks, but never starts before the last newline already seen
+        last_newline = self._pending.rfind("\n")
+        scan_from = last_newline if last_newline >= 0 else len(self._pending)
+        self._pending += chunk
+
+        pos = 0
+        for match in BLOCK_SEPARATOR.finditer(self._pending, scan_from):
+            self._add_block(self._pending[pos : match.start()], self._pending_start + match.start())
+            pos = match.end()
+        self._pending = self._pending[pos:]
+        self._pending_start += pos
+        return self.detected
+
+    def finish(self) -> bool:
+        """Flush the final unterminated block; return True if a loop was detected."""
+        if self._pending.strip():
+            self._add_block(self._pending, self._pending_start + len(self._pending))
+        self._pending_start += len(self._pending)
+        self._pending = ""
+        return self.detected
+
+    def text(self) -> str:
+        """Return the consumed text with the repeated copies of any detected loop removed.
+
+        Text after the loop is kept; a block still being streamed is dropped.
+        """
+        text = "".join(self._text)
+        if self.loop_end is None:
+            return text
+        after = text[self._repeat_end : self._pending_start]
+        if not after.strip():
+            return text[: self.loop_end].rstrip() + "\n"
+        return text[: self.loop_end] + after
+
+    def _add_block(self, block: str, end: int) -> None:
+        if not block.strip():
+            return
+        index = len(self._hashes)
+        fingerprint = _fingerprint(block)
+        self._hashes.append(fingerprint)
+        self._ends.append(end)
+        self._sizes.append(self._sizes[-1] + len(block.strip()))
+
+        if self.detected:
+            # Extend the loop while blocks keep repeating it
+            if self._repeating and self._hashes[index - self._loop_period] == fingerprint:
+                self._repeat_end = end
+            else:
+                self._repeating = False
+            return
+
+        for period in range(1, min(self.max_period, index) + 1):
+            if self._hashes[index - period] == fingerprint:
+                self._runs[period] += 1
+            else:
+                self._runs[period] = 0
+                continue
+
+            run = self._runs[period]
+            copies = 1 + run // period
+            if copies < self.min_repeats:
+                continue
+            # Blocks [first, index] hold `copies` full copies of the repeating unit
+            first = index - copies * period + 1
+            if self._sizes[index + 1] - self._sizes[first] < self.min_loop_chars:
+                continue
+            self.loop_end = self._ends[first + period - 1]
+            self._loop_period = period
+            self._repeat_end = end
+            self._repeating = True
+            return
+
+
+def trim_repetition(
+    text: str,
+    min_repeats: int = DEFAULT_MIN_REPEATS,
+    min_loop_chars: int = DEFAULT_MIN_LOOP_CHARS,
+    max_period: int = DEFAULT_MAX_PERIOD,
+) -> tuple[str, bool]:
+    """Remove the repeated copies of a loop from complete text, keeping its first copy and what follows."""
+    detector = RepetitionDetector(min_repeats, min_loop_chars, max_period)
+    detector.feed(text)
+    detector.finish()
+    return detector.text(), detector.detected
@@ -0,0 +1,51 @@
+"""Tests for the shared screenplay syntax helpers."""
+
+import pytest
+
+from screenplay_writer_agent.common import HEADING, env_flag, is_character_cue, is_transition
+
+
+@pytest.mark.parametrize(
+    "line",
+    ["INT. KITCHEN - NIGHT", "EXT. DOCKS - DAWN", "INT./EXT. CAR - DAY", "INT/EXT. CAR - DAY", "I/E. VAN", "EST. CITY"],
+)
+def test_heading_prefixes(line):
+    """Test that every scene heading form is recognized."""
+    assert HEADING.match(line)
+
+
+@pytest.mark.parametrize(
+    ("line", "expected"),
+    [
+        ("SARAH", True),
+        ("MARK (V.O.)", True),
+        ("DR. SMITH", True),
+        ("INT. KITCHEN - NIGHT", False),
+        ("FADE IN:", False),
+        ("CUT TO:", False),
+        ("GENRE:", False),
+        ("(quietly)", False),
+        ("Sarah", False),
+        ("THIS LINE IS FAR TOO LONG TO BE A CUE", False),
+    ],
+)
+def test_is_character_cue(line, expected):
+    """Test the character cue rule shared by the linter, paginator and fast path."""
+    assert is_character_cue(line) is expected
+
+
+def test_is_transition():
+    """Test that transitions are told apart from cues."""
+    assert is_transition("SMASH CUT TO:")
+    assert is_transition("FADE OUT.")
+    assert not is_transition("SARAH")
+
+
+def test_env_flag(monkeypatch):
+    """Test parsing of true/false settings."""
+    monkeypatch.setenv("SOME_FLAG", "Yes")
+    assert env_flag("SOME_FLAG")
+    monkeypatch.setenv("SOME_FLAG", "off")
+    assert not env_flag("SOME_FLAG", default=True)
+    monkeypatch.delenv("SOME_FLAG")
+    assert env_flag("SOME_FLAG", default=True)
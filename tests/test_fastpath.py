@@ -0,0 +1,137 @@
+"""Tests for detecting inputs that can be formatted without the LLM."""
+
+from screenplay_writer_agent.fastpath import (
+    KIND_FOUNTAIN,
+    KIND_IDEA,
+    KIND_SCREENPLAY,
+    KIND_TRANSCRIPT,
+    FastPathStats,
+    classify_input,
+    prepare_local_draft,
+)
+
+TRANSCRIPT = """Format this raw dialogue into proper screenplay format:
+Sarah: I never thought it would come to this.
+Mark: (quietly) You left me no choice.
+[A door slams somewhere below.]
+Sarah: Then we finish it
+tonight."""
+
+DRAFT = """INT. WAREHOUSE - NIGHT
+
+Rain leaks through the roof.
+
+SARAH
+I never thought it would come to this.
+
+MARK
+(quietly)
+You left me no choice.
+Not after what you did."""
+
+FOUNTAIN = """Title: The Warehouse
+Author: Someone
+
+.ROOFTOP
+
+[[Check the location permit]]
+@McCLANE
+Yippee ki-yay.
+
+/* cut this beat
+MARK
+Maybe.
+*/
+> CUT TO:
+
+SARAH
+Go."""
+
+
+def test_classify_input_kinds():
+    """Test that drafts, Fountain and transcripts are told apart from ideas."""
+    assert classify_input(DRAFT) == KIND_SCREENPLAY
+    assert classify_input(FOUNTAIN) == KIND_FOUNTAIN
+    assert classify_input(TRANSCRIPT.partition("\n")[2]) == KIND_TRANSCRIPT
+    assert classify_input("Write a romantic comedy scene between two strangers") == KIND_IDEA
+    assert classify_input("A detective story.\nSet in Neo Tokyo: rain, neon and regret.") == KIND_IDEA
+
+
+def test_structured_briefs_are_ideas():
+    """Test that idea briefs with "Key: value" fields or a character list go to the LLM."""
+    briefs = [
+        "Genre: romantic comedy\nSetting: a bookstore in the rain\nCharacters: two strangers\nTone: warm",
+        "Logline: A retired cop takes one last case.\nSetting: Neo Tokyo",
+        "Characters:\nJOHN\nA grizzled cop.\nMARY\nA sharp lawyer.",
+        "Title: Last Call\nGenre: noir\nPlot: a bartender hides a witness",
+    ]
+    for brief in briefs:
+        assert classify_input(brief) == KIND_IDEA, brief
+        assert prepare_local_draft(brief) is None
+
+
+def test_speakers_must_come_back():
+    """Test that one line per name reads as a list, not an exchange."""
+    assert classify_input("Budget: low\nRuntime: 90 minutes") == KIND_IDEA
+    assert classify_input("JOHN\nA grizzled cop.\nMARY\nA sharp lawyer.") == KIND_IDEA
+    assert classify_input("JOHN\nYou came back.\nMARY\nI had to.\nJOHN\nWhy?") == KIND_SCREENPLAY
+
+
+def test_transcript_becomes_cue_and_dialogue_blocks():
+    """Test that speaker-prefixed lines become cues, parentheticals and dialogue."""
+    kind, draft = prepare_local_draft(TRANSCRIPT)
+
+    assert kind == KIND_TRANSCRIPT
+    assert draft.split("\n\n") == [
+        "SARAH\nI never thought it would come to this.",
+        "MARK\n(quietly)\nYou left me no choice.",
+        "A door slams somewhere below.",
+        "SARAH\nThen we finish it tonight.",
+    ]
+
+
+def test_draft_joins_multiline_dialogue():
+    """Test that continuation lines stay in the speech instead of turning into action."""
+    _, draft = prepare_local_draft(DRAFT)
+
+    assert "MARK\n(quietly)\nYou left me no choice. Not after what you did." in draft
+
+
+def test_fountain_markup_is_resolved():
+    """Test that title page, notes, boneyard and forced elements are stripped."""
+    kind, draft = prepare_local_draft(FOUNTAIN)
+
+    assert kind == KIND_FOUNTAIN
+    assert "Title:" not in draft
+    assert "permit" not in draft
+    assert "Maybe." not in draft
+    assert "MCCLANE\nYippee ki-yay." in draft
+    assert "CUT TO:" in draft
+
+
+def test_creative_instruction_goes_to_llm():
+    """Test that a script with a creative request is not formatted locally."""
+    assert prepare_local_draft("Rewrite this as a thriller:\n" + DRAFT) is None
+    assert prepare_local_draft("Write a heist movie about two sisters") is None
+
+
+def test_only_formatting_instructions_stay_local():
+    """Test that any leading request other than plain formatting goes to the LLM."""
+    exchange = "Sarah: We have to go.\nMark: Not yet.\nSarah: Now."
+
+    assert prepare_local_draft("Translate to French:\n" + exchange) is None
+    assert prepare_local_draft("Can you punch up this dialogue?\n" + exchange) is None
+    assert prepare_local_draft("Please tighten these lines\n" + exchange) is None
+    assert prepare_local_draft("Clean up this transcript:\n" + exchange)[0] == KIND_TRANSCRIPT
+    assert prepare_local_draft(exchange)[0] == KIND_TRANSCRIPT
+    assert prepare_local_draft("FADE IN:\n\n" + DRAFT)[0] == KIND_SCREENPLAY
+
+
+def test_stats_report_hit_rate():
+    """Test that fast path usage is counted."""
+    stats = FastPathStats()
+    stats.record_local(KIND_TRANSCRIPT, 2.0)
+    stats.record_llm()
+
+    assert stats.hit_rate == 0.5
+    assert "1/2 requests (50%)" in stats.summary()
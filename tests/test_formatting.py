@@ -0,0 +1,68 @@
+"""Linear-time and input-limit tests for the screenplay formatter."""
+
+import random
+import re
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from screenplay_writer_agent.main import (
+    MAX_INPUT_CHARS,
+    _strip_code_fences,
+    _strip_fade_in,
+    enforce_screenplay_format,
+    handler,
+)
+
+# Generous ceiling so slow CI machines pass while quadratic behaviour still fails
+SECONDS_PER_MB = 2.0
+MB = 1024 * 1024
+
+ADVERSARIAL_INPUTS = {
+    "unbalanced_fences": "```" + "x" * MB,
+    "many_unbalanced_fences": "```\n" + "`` a\n" * (MB // 5),
+    "fade_in_without_newline": "FADE IN " * (MB // 8),
+    "huge_single_line": "word " * (MB // 5),
+    "whitespace_scene_header": "INT. " + " " * MB + "-",
+    "blank_line_flood": "\n \n" * (MB // 3),
+    "header_like_lines": "INT. ROOM - - - - - - - - - - - - - - - - - - -\n" * (MB // 48),
+}
+
+
+@pytest.mark.parametrize("name", sorted(ADVERSARIAL_INPUTS))
+def test_formatter_time_per_mb(name):
+    """Test that adversarial model output formats within the per-MB time ceiling."""
+    text = ADVERSARIAL_INPUTS[name]
+
+    start = time.perf_counter()
+    result = enforce_screenplay_format(text)
+    elapsed = time.perf_counter() - start
+
+    assert result.startswith("FADE IN:")
+    assert elapsed < SECONDS_PER_MB * max(1.0, len(text) / MB), f"{name} took {elapsed:.2f}s"
+
+
+def test_strip_helpers_match_original_regexes():
+    """Test that the linear scans behave exactly like the regexes they replace."""
+    rng = random.Random(1234)  # noqa: S311
+    alphabet = ["```", "`", "FADE IN", "fade in", "\n", "a", " ", "INT."]
+    for _ in range(500):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        assert _strip_code_fences(text) == re.sub(r"```.*?```", "", text, flags=re.DOTALL)
+        assert _strip_fade_in(text) == re.sub(r"FADE IN.*?\n", "", text, flags=re.IGNORECASE)
+
+
+@pytest.mark.asyncio
+async def test_handler_rejects_oversized_input():
+    """Test that input above the documented limit is rejected before running the crew."""
+    messages = [{"role": "user", "content": "x" * (MAX_INPUT_CHARS + 1)}]
+
+    with (
+        patch("screenplay_writer_agent.main._initialized", True),
+        patch("screenplay_writer_agent.main.run_crew", new_callable=AsyncMock) as mock_run,
+    ):
+        result = await handler(messages)
+
+    mock_run.assert_not_called()
+    assert "Input too long" in result
@@ -0,0 +1,135 @@
+"""Tests for the persistent job queue."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from screenplay_writer_agent.jobs import JOB_DONE, JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JobQueue, JobStore
+
+CREW_ERROR = "crew exploded"
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Provide a job store backed by a temporary SQLite file."""
+    job_store = JobStore(tmp_path / "jobs.db")
+    yield job_store
+    job_store.close()
+
+
+def test_claim_next_respects_priority_then_age(store):
+    """Test that higher priority jobs run first and ties run in submission order."""
+    low = store.submit("low priority idea", priority=0)
+    first_high = store.submit("first urgent idea", priority=5)
+    second_high = store.submit("second urgent idea", priority=5)
+
+    assert store.claim_next().id == first_high.id
+    assert store.claim_next().id == second_high.id
+    assert store.claim_next().id == low.id
+    assert store.claim_next() is None
+
+
+def test_requeue_interrupted_after_restart(tmp_path):
+    """Test that jobs left running by a crashed process are re-queued on reopen."""
+    path = tmp_path / "jobs.db"
+    crashed = JobStore(path)
+    job = crashed.submit("a heist thriller")
+    assert crashed.claim_next().status == JOB_RUNNING
+    crashed.close()
+
+    reopened = JobStore(path)
+    try:
+        assert reopened.requeue_interrupted() == 1
+        recovered = reopened.get(job.id)
+        assert recovered.status == JOB_QUEUED
+        assert recovered.attempts == 1
+    finally:
+        reopened.close()
+
+
+def test_purge_expired_only_removes_old_finished_jobs(store):
+    """Test that result retention deletes finished jobs past their TTL."""
+    done = store.submit("finished idea")
+    pending = store.submit("pending idea")
+    store.claim_next()
+    store.complete(done.id, "FADE IN:")
+
+    finished_at = store.get(done.id).finished_at
+    assert store.purge_expired(ttl_seconds=60, now=finished_at + 30) == 0
+    assert store.purge_expired(ttl_seconds=60, now=finished_at + 61) == 1
+    assert store.get(done.id) is None
+    assert store.get(pending.id).status == JOB_QUEUED
+
+
+@pytest.mark.asyncio
+async def test_job_queue_drains_jobs(store):
+    """Test that the worker pool runs queued jobs and records results and failures."""
+
+    async def runner(input_text: str) -> str:
+        if input_text == "boom":
+            raise RuntimeError(CREW_ERROR)
+        return f"FADE IN: {input_text}"
+
+    queue = JobQueue(store, runner, workers=2, poll_interval=0.01)
+    await queue.start()
+    try:
+        ok = queue.submit("a quiet drama")
+        bad = queue.submit("boom")
+        for _ in range(200):
+            if store.get(ok.id).status == JOB_DONE and store.get(bad.id).status == JOB_FAILED:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await queue.stop()
+
+    assert store.get(ok.id).result == "FADE IN: a quiet drama"
+    assert store.get(bad.id).error == CREW_ERROR
+
+
+@pytest.mark.asyncio
+async def test_jobs_interrupted_too_often_are_failed(store):
+    """Test that a job whose worker keeps dying is failed once it reaches max_attempts."""
+    job = store.submit("an idea that crashes the worker")
+    queue = JobQueue(store, AsyncMock(return_value="FADE IN:"), max_attempts=2, poll_interval=0.01)
+
+    # First crash: the job is re-queued and claimed again
+    store.claim_next()
+    assert store.fail_exhausted(queue.max_attempts) == 0
+    store.requeue_interrupted()
+    store.claim_next()
+
+    # Second crash: the next start gives up on it instead of running it a third time
+    await queue.start()
+    await queue.stop()
+
+    failed = store.get(job.id)
+    assert failed.status == JOB_FAILED
+    assert failed.attempts == 2
+    assert "giving up" in failed.error
+    queue.runner.assert_not_called()
+
+
+def test_queue_started_in_thread_runs_jobs_submitted_from_another_loop(store):
+    """Test that workers started at server startup pick up jobs submitted by the request loop."""
+
+    async def runner(input_text: str) -> str:
+        return f"FADE IN: {input_text}"
+
+    queue = JobQueue(store, runner, poll_interval=60)
+    queue.start_in_thread()
+
+    async def serve() -> str:
+        job = queue.submit("a quiet drama")
+        for _ in range(200):
+            if store.get(job.id).status == JOB_DONE:
+                break
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        return job.id
+
+    job_id = asyncio.run(serve())
+
+    # Woken by submit rather than the 60 second poll
+    assert store.get(job_id).result == "FADE IN: a quiet drama"
+    assert not queue.running
@@ -0,0 +1,90 @@
+"""Tests for the screenplay layout and pagination engine."""
+
+import pytest
+
+from screenplay_writer_agent.layout import (
+    CONTD,
+    LINES_PER_PAGE,
+    MORE,
+    paginate,
+    parse_page_range,
+    render_element,
+    wrap,
+)
+
+SCENE = (
+    "INT. LAB - NIGHT\n\n"
+    "Dr. Alex Rivera hunches over a flickering terminal, fingers racing across the keys "
+    "as alarms wail somewhere deep in the building.\n\n"
+    "ALEX\n"
+    "(muttering)\n"
+    "Come on, come on. You were built to think, so think.\n\n"
+    "MAYA\n"
+    "Alex, we have to go.\n\n"
+)
+
+
+def test_wrap_respects_width_and_splits_long_words():
+    """Test that wrapping never exceeds the element width."""
+    lines = wrap("a " * 40 + "x" * 70, 35)
+
+    assert all(len(line) <= 35 for line in lines)
+    assert "".join(lines[-2:]) == "x" * 70
+
+
+def test_render_element_applies_industry_margins():
+    """Test dialogue, parenthetical and character indents and widths."""
+    dialogue = render_element("dialogue", "Come on, come on. You were built to think, so think.")
+    parenthetical = render_element("parenthetical", "(muttering under her breath as she types)")
+
+    assert all(line.startswith(" " * 10) and len(line) <= 45 for line in dialogue)
+    assert len(dialogue) == 2
+    assert all(line.startswith(" " * 15) and len(line) <= 40 for line in parenthetical)
+    assert render_element("character", "ALEX") == [" " * 20 + "ALEX"]
+    assert render_element("transition", "CUT TO:") == ["CUT TO:".rjust(60)]
+
+
+def test_paginate_indexes_pages_for_range_extraction():
+    """Test that page breaks respect the page length and ranges slice by offset."""
+    index = paginate("FADE IN:\n\n" + SCENE * 40 + "FADE OUT.")
+
+    assert index.page_count > 5
+    pages = index.text.split("\f")
+    assert len(pages) == index.page_count
+    for number, page in enumerate(pages, start=1):
+        body = page.rstrip("\n").split("\n")[2 if number > 1 else 0 :]
+        assert len(body) <= LINES_PER_PAGE
+        assert index.pages(number) == (page if number == 1 else "\f" + page)
+    assert index.pages(2, 3) == index.pages(2) + index.pages(3)
+    assert index.pages(2).lstrip("\f").lstrip().startswith("2.")
+    assert index.pages(index.page_count + 5) == ""
+
+
+def test_scene_heading_is_never_orphaned_at_page_bottom():
+    """Test that a scene heading always has content after it on the same page."""
+    index = paginate(SCENE * 40)
+
+    for page in index.text.split("\f"):
+        lines = [line for line in page.rstrip("\n").split("\n") if line.strip()]
+        assert not lines[-1].startswith("INT.")
+
+
+def test_long_dialogue_breaks_with_more_and_contd():
+    """Test that dialogue split across pages gets (MORE) and (CONT'D)."""
+    text = "INT. ROOM - DAY\n\nALEX\n(quietly)\n" + "I keep talking and talking. " * 120
+
+    index = paginate(text, lines_per_page=30)
+
+    first, second = index.text.split("\f")[:2]
+    assert first.rstrip().endswith(MORE)
+    assert f"ALEX{CONTD}" in second
+    assert index.page_count >= 3
+
+
+def test_parse_page_range():
+    """Test page range parsing."""
+    assert parse_page_range("30-45") == (30, 45)
+    assert parse_page_range("30\u201345") == (30, 45)
+    assert parse_page_range("7") == (7, 7)
+    with pytest.raises(ValueError):
+        parse_page_range("pages thirty")
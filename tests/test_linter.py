@@ -0,0 +1,138 @@
+"""Tests for the format-compliance linter and targeted scene repair."""
+
+import pytest
+
+from screenplay_writer_agent.linter import (
+    ISSUE_MISSING_HEADING,
+    ISSUE_MIXED_DIALOGUE,
+    ISSUE_PROSE_PARAGRAPH,
+    ISSUE_WE_SEE,
+    lint_scene,
+    lint_screenplay,
+    repair_screenplay,
+    split_scenes,
+)
+
+GOOD_SCENE = "EXT. CITY STREET - NIGHT\n\nRain pours down heavily.\n\nJAMES\nWe can't stop now.\n\n"
+BAD_SCENE = (
+    "INT. WAREHOUSE - NIGHT\n\n"
+    "We see James creep between the crates. He is tired. He has been running for hours. "
+    'The warehouse is dark and cold and smells of oil. He stops. "Sarah, are you here?" he whispers.\n\n'
+)
+REPAIRED_SCENE = (
+    "INT. WAREHOUSE - NIGHT\n\nJames creeps between the crates.\n\nJAMES\n(whispering)\nSarah, are you here?"
+)
+RATE_LIMITED = "rate limited"
+
+
+def test_lint_scene_passes_well_formed_scene():
+    """Test that a compliant scene scores full marks."""
+    report = lint_scene(GOOD_SCENE)
+
+    assert report.passed
+    assert report.score == 1.0
+    assert report.issues == []
+
+
+def test_lint_scene_flags_writing_task_violations():
+    """Test that prose, "We see" and mixed dialogue are reported."""
+    report = lint_scene(BAD_SCENE)
+
+    assert not report.passed
+    assert set(report.issues) == {ISSUE_PROSE_PARAGRAPH, ISSUE_WE_SEE, ISSUE_MIXED_DIALOGUE}
+    assert ISSUE_MISSING_HEADING in lint_scene("James runs down the alley.").issues
+
+
+def test_lint_scene_requires_heading_after_leading_transition():
+    """Test that FADE IN: does not excuse the scene that follows it from having a heading."""
+    headingless = "FADE IN:\n\nJohn walks into the room. He sits.\n\nFADE OUT."
+    opening = "FADE IN:\n\nJohn walks in.\n\nJOHN\nHello.\n\n"
+
+    assert ISSUE_MISSING_HEADING in lint_scene(headingless).issues
+    assert ISSUE_MISSING_HEADING in lint_screenplay(opening + GOOD_SCENE)[0].issues
+    assert lint_scene("FADE IN:\n\n").issues == []
+    assert lint_scene("CUT TO:\n\n" + GOOD_SCENE).issues == []
+
+
+@pytest.mark.parametrize(
+    "action",
+    [
+        'A neon sign flickers: "OPEN ALL NIGHT."',
+        'The banner reads "Welcome home, Sarah."',
+        "INSERT: The letter reads: Come home.",
+        "SUPER: Three years later.",
+        "The letter reads: Come home.",
+    ],
+)
+def test_lint_scene_allows_signs_and_inserts(action):
+    """Test that written text and inserts in action are not mistaken for dialogue."""
+    report = lint_scene(f"INT. DINER - NIGHT\n\n{action}\n\nJAMES\nCoffee, please.\n")
+
+    assert report.issues == []
+    assert report.score == 1.0
+
+
+def test_lint_scene_flags_speaker_lines_in_action():
+    """Test that "Name: line" dialogue inside action is still reported."""
+    report = lint_scene("INT. DINER - NIGHT\n\nJames sits.\nSarah: We have to go.\n")
+
+    assert report.issues == [ISSUE_MIXED_DIALOGUE]
+
+
+def test_split_scenes_round_trips():
+    """Test that splitting and joining scenes preserves the text."""
+    text = "FADE IN:\n\n" + GOOD_SCENE + BAD_SCENE + "FADE OUT."
+
+    scenes = split_scenes(text)
+
+    assert "".join(scenes) == text
+    assert [report.passed for report in lint_screenplay(text)] == [True, True, False]
+
+
+@pytest.mark.asyncio
+async def test_repair_screenplay_only_sends_failing_scenes():
+    """Test that only failing scenes are repaired and spliced back in place."""
+    prompts = []
+
+    async def repair(prompt: str) -> str:
+        prompts.append(prompt)
+        return REPAIRED_SCENE
+
+    text = "FADE IN:\n\n" + GOOD_SCENE + BAD_SCENE + GOOD_SCENE + "FADE OUT."
+    result, repaired = await repair_screenplay(text, repair)
+
+    assert len(prompts) == 1
+    assert "James creep between the crates" in prompts[0]
+    assert [report.index for report in repaired] == [2]
+    assert result == "FADE IN:\n\n" + GOOD_SCENE + REPAIRED_SCENE + "\n\n" + GOOD_SCENE + "FADE OUT."
+
+
+@pytest.mark.asyncio
+async def test_repair_screenplay_keeps_original_when_repair_is_worse():
+    """Test that failed or unhelpful repairs leave the scene untouched."""
+
+    async def repair(prompt: str) -> str:
+        raise RuntimeError(RATE_LIMITED)
+
+    text = "FADE IN:\n\n" + BAD_SCENE
+    result, repaired = await repair_screenplay(text, repair)
+
+    assert result == text
+    assert repaired == []
+
+
+@pytest.mark.asyncio
+async def test_repair_screenplay_reports_only_spliced_scenes():
+    """Test that scenes whose repair failed are not reported as repaired."""
+
+    async def repair(prompt: str) -> str:
+        if "LOADING DOCK" in prompt:
+            raise RuntimeError(RATE_LIMITED)
+        return REPAIRED_SCENE
+
+    other_bad = BAD_SCENE.replace("WAREHOUSE", "LOADING DOCK", 1)
+    text = "FADE IN:\n\n" + BAD_SCENE + other_bad
+    result, repaired = await repair_screenplay(text, repair)
+
+    assert [report.index for report in repaired] == [1]
+    assert result == "FADE IN:\n\n" + REPAIRED_SCENE + "\n\n" + other_bad
@@ -0,0 +1,172 @@
+"""Tests for the non-blocking logging pipeline."""
+
+import asyncio
+import io
+import json
+import logging
+import queue
+import time
+
+import pytest
+
+from screenplay_writer_agent.log import (
+    DroppingQueueHandler,
+    LoggingPipeline,
+    describe_prompt,
+    get_logger,
+    parse_sampling,
+    request_context,
+)
+
+
+def _lines(stream: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+@pytest.fixture
+def pipeline():
+    """Start a pipeline writing JSON lines to a buffer."""
+    stream = io.StringIO()
+    pipeline = LoggingPipeline(stream=stream, level=logging.DEBUG)
+    pipeline.start()
+    yield pipeline, stream
+    pipeline.stop()
+
+
+def test_records_are_written_as_json_with_request_id(pipeline):
+    """Test that records carry the request id and extra fields."""
+    pipeline, stream = pipeline
+    logger = get_logger("test")
+
+    with request_context("abc123"):
+        logger.info("Processing %s", "idea", extra={"prompt": {"chars": 5}})
+    logger.info("Outside")
+    pipeline.stop()
+
+    first, second = _lines(stream)
+    assert first["msg"] == "Processing idea"
+    assert first["request_id"] == "abc123"
+    assert first["prompt"] == {"chars": 5}
+    assert first["logger"] == "screenplay_writer_agent.test"
+    assert second["request_id"] == "-"
+
+
+def test_request_id_follows_tasks_and_threads(pipeline):
+    """Test that the request id reaches awaited coroutines and to_thread workers."""
+    pipeline, stream = pipeline
+    logger = get_logger("test")
+
+    async def request(request_id: str) -> None:
+        with request_context(request_id):
+            await asyncio.sleep(0)
+            await asyncio.to_thread(logger.info, "in thread")
+
+    async def run() -> None:
+        await asyncio.gather(request("one"), request("two"))
+
+    asyncio.run(run())
+    pipeline.stop()
+
+    assert sorted(line["request_id"] for line in _lines(stream)) == ["one", "two"]
+
+
+def test_exceptions_are_formatted_by_the_writer(pipeline):
+    """Test that tracebacks survive the trip through the queue."""
+    pipeline, stream = pipeline
+
+    def fail() -> None:
+        raise ValueError("boom")
+
+    try:
+        fail()
+    except ValueError:
+        get_logger("test").exception("Failed")
+    pipeline.stop()
+
+    (line,) = _lines(stream)
+    assert "ValueError: boom" in line["exc"]
+
+
+def test_long_messages_are_truncated():
+    """Test that oversized messages are cut before they are written."""
+    stream = io.StringIO()
+    pipeline = LoggingPipeline(stream=stream, max_message_chars=50)
+    pipeline.start()
+    get_logger("test").info("x" * 1000)
+    pipeline.stop()
+
+    (line,) = _lines(stream)
+    assert line["msg"].startswith("x" * 50 + "...")
+    assert "950 more chars" in line["msg"]
+
+
+def test_full_queue_drops_instead_of_blocking():
+    """Test that the request path never waits on a full queue."""
+    handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+    logger = logging.getLogger("screenplay_writer_agent.test_drop")
+    logger.addHandler(handler)
+    logger.propagate = False
+    try:
+        for _ in range(10):
+            logger.warning("flood")
+    finally:
+        logger.removeHandler(handler)
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 8
+
+
+def test_sampling_drops_a_share_of_a_level():
+    """Test that per-level sampling keeps other levels intact."""
+    stream = io.StringIO()
+    pipeline = LoggingPipeline(stream=stream, level=logging.DEBUG, sampling={logging.DEBUG: 0.0})
+    pipeline.start()
+    logger = get_logger("test")
+    for _ in range(20):
+        logger.debug("noisy")
+    logger.info("kept")
+    pipeline.stop()
+
+    assert [line["msg"] for line in _lines(stream)] == ["kept"]
+
+
+def test_parse_sampling():
+    """Test parsing of the LOG_SAMPLING setting."""
+    assert parse_sampling("DEBUG=0.1, info=1") == {logging.DEBUG: 0.1, logging.INFO: 1.0}
+    assert parse_sampling("") == {}
+
+
+def test_describe_prompt_hides_text_by_default():
+    """Test that prompts are logged as length and hash unless a preview is enabled."""
+    summary = describe_prompt("A heist in Paris")
+
+    assert summary["chars"] == 16
+    assert len(summary["sha256"]) == 12
+    assert "preview" not in summary
+
+
+def test_describe_prompt_preview_is_redacted():
+    """Test that previews mask emails, keys and long numbers."""
+    text = "Mail jane.doe@example.com, key sk-abcdef1234567890, card 4111 1111 1111 1111. " + "x" * 100
+    summary = describe_prompt(text, preview_chars=90)
+
+    preview = summary["preview"]
+    assert "jane.doe" not in preview
+    assert "sk-abcdef" not in preview
+    assert "4111" not in preview
+    assert "[email]" in preview
+    assert "[secret]" in preview
+    assert preview.endswith("...")
+
+
+def test_logging_overhead_on_request_path(pipeline):
+    """Test that emitting a record costs well under a millisecond on the calling thread."""
+    pipeline, _ = pipeline
+    logger = get_logger("test")
+
+    started = time.perf_counter()
+    for i in range(1000):
+        logger.info("line %d", i)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed / 1000 < 0.001
@@ -1,6 +1,9 @@
 """Tests for the Screenplay Writer Agent."""
 
+import asyncio
+import json
 import os
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -9,7 +12,10 @@ import pytest
 os.environ["OPENROUTER_API_KEY"] = "test-key-for-ci"
 os.environ["OPENAI_API_KEY"] = "test-key-for-ci"
 
-from screenplay_writer_agent.main import handler
+from screenplay_writer_agent.fastpath import FastPathStats
+from screenplay_writer_agent.jobs import JobQueue, JobStore
+from screenplay_writer_agent.main import _watch_stream, handler, run_crew
+from screenplay_writer_agent.prompt_cache import PromptCache, PromptCacheConfig
 
 
 @pytest.mark.asyncio
@@ -64,6 +70,7 @@ async def test_handler_initialization():
     with (
         patch("screenplay_writer_agent.main._initialized", False),
         patch("screenplay_writer_agent.main.initialize_crew", new_callable=AsyncMock) as mock_init,
+        patch("screenplay_writer_agent.main.initialize_job_queue", new_callable=AsyncMock),
         patch(
             "screenplay_writer_agent.main.run_crew", new_callable=AsyncMock, return_value=mock_screenplay
         ) as mock_run,
@@ -97,6 +104,7 @@ async def test_handler_race_condition_prevention():
     with (
         patch("screenplay_writer_agent.main._initialized", False),
         patch("screenplay_writer_agent.main.initialize_crew", new_callable=AsyncMock) as mock_init,
+        patch("screenplay_writer_agent.main.initialize_job_queue", new_callable=AsyncMock),
         patch("screenplay_writer_agent.main.run_crew", new_callable=AsyncMock, return_value=mock_screenplay),
         patch("screenplay_writer_agent.main._init_lock", new_callable=MagicMock()) as mock_lock,
     ):
@@ -192,3 +200,147 @@ async def test_handler_edge_case_malformed_messages():
     assert result is not None
     assert isinstance(result, str)
     assert "Please provide" in result
+
+
+@pytest.mark.asyncio
+async def test_handler_job_result_page_range(tmp_path):
+    """Test that a finished job's result can be fetched by page range."""
+    store = JobStore(tmp_path / "jobs.db")
+    job = store.submit("A long heist thriller")
+    store.claim_next()
+    scene = "INT. VAULT - NIGHT\n\nThe crew moves in silence past the lasers.\n\nRAY\nNobody breathe.\n\n"
+    store.complete(job.id, "FADE IN:\n\n" + scene * 60 + "FADE OUT.")
+    queue = JobQueue(store, AsyncMock())
+
+    content = json.dumps({"action": "result", "job_id": job.id, "pages": "2-3"})
+    with (
+        patch("screenplay_writer_agent.main._initialized", True),
+        patch("screenplay_writer_agent.main.job_queue", queue),
+    ):
+        response = json.loads(await handler([{"role": "user", "content": content}]))
+    store.close()
+
+    assert response["success"]
+    assert response["page_count"] > 3
+    assert response["pages"] == "2-3"
+    assert response["result"].lstrip("\f").lstrip().startswith("2.")
+    assert response["result"].count("\f") == 2
+
+
+@pytest.mark.asyncio
+async def test_handler_job_result_page_range_past_the_end(tmp_path):
+    """Test that a page range starting after the last page is rejected."""
+    store = JobStore(tmp_path / "jobs.db")
+    job = store.submit("A short heist")
+    store.claim_next()
+    store.complete(job.id, "FADE IN:\n\nINT. VAULT - NIGHT\n\nThe crew moves in.\n\nFADE OUT.")
+    queue = JobQueue(store, AsyncMock())
+
+    content = json.dumps({"action": "result", "job_id": job.id, "pages": "50-60"})
+    with (
+        patch("screenplay_writer_agent.main._initialized", True),
+        patch("screenplay_writer_agent.main.job_queue", queue),
+    ):
+        response = json.loads(await handler([{"role": "user", "content": content}]))
+    store.close()
+
+    assert not response["success"]
+    assert response["error"] == "Invalid page range: 50-60 (last page is 1)"
+
+
+@pytest.mark.asyncio
+async def test_handler_formats_transcript_without_crew():
+    """Test that a raw dialogue transcript is formatted locally without the LLM."""
+    content = (
+        "Format this raw dialogue into proper screenplay format:\nSarah: We have to go.\nMark: Not yet.\nSarah: Now."
+    )
+
+    with (
+        patch("screenplay_writer_agent.main._initialized", True),
+        patch("screenplay_writer_agent.main.crew", None),
+    ):
+        result = await handler([{"role": "user", "content": content}])
+
+    assert result.startswith("FADE IN:")
+    assert " " * 20 + "SARAH" in result
+    assert " " * 10 + "Not yet." in result
+
+
+@pytest.mark.asyncio
+async def test_run_crew_serves_near_duplicate_prompt_from_cache():
+    """Test that a rephrased prompt is answered from the prompt cache without the crew."""
+    mock_crew = MagicMock()
+    mock_crew.copy.return_value.kickoff.return_value = "INT. BOOKSHOP - DAY\n\nTwo strangers reach for one book."
+
+    with (
+        patch("screenplay_writer_agent.main.crew", mock_crew),
+        patch("screenplay_writer_agent.main.repair_llm", None),
+        patch("screenplay_writer_agent.main.prompt_cache", PromptCache(PromptCacheConfig(enabled=True))),
+        patch("screenplay_writer_agent.main.fast_path_stats", FastPathStats()) as stats,
+    ):
+        first = await run_crew("Write a rom-com scene with two strangers")
+        second = await run_crew("romantic comedy scene between two strangers")
+
+    assert mock_crew.copy.return_value.kickoff.call_count == 1
+    assert second == first
+    # The cache hit is not counted as a crew call
+    assert stats.llm == 1
+
+
+@pytest.mark.asyncio
+async def test_run_crew_aborts_looping_stream():
+    """Test that a streamed reply is cut off inside the LLM call once it starts looping."""
+    exchange = (
+        "JAMES\nWe can't stop now. They're right behind us and closing fast.\n\n"
+        "Sarah grabs the wheel and swerves hard into the narrow alley.\n\n"
+    )
+    reply = "Thought: I now can give a great answer\nFinal Answer: EXT. CITY STREET - NIGHT\n\n" + exchange * 50
+    streamed = []
+
+    def kickoff(inputs):
+        for start in range(0, len(reply), 16):
+            streamed.append(reply[start : start + 16])
+            _watch_stream(None, SimpleNamespace(chunk=streamed[-1]))
+        return reply
+
+    mock_crew = MagicMock()
+    mock_crew.copy.return_value.kickoff.side_effect = kickoff
+
+    with (
+        patch("screenplay_writer_agent.main.crew", mock_crew),
+        patch("screenplay_writer_agent.main.repair_llm", None),
+        patch("screenplay_writer_agent.main.prompt_cache", PromptCache()),
+    ):
+        result = await run_crew("A car chase in the rain")
+
+    assert len("".join(streamed)) < len(exchange) * 5
+    assert result.count("We can't stop now") == 1
+    assert "EXT. CITY STREET - NIGHT" in result
+    assert "Final Answer" not in result
+
+
+@pytest.mark.asyncio
+async def test_failed_crew_run_marks_job_failed(tmp_path):
+    """Test that a kickoff error reaches the job queue instead of being stored as a result."""
+    mock_crew = MagicMock()
+    mock_crew.copy.return_value.kickoff.side_effect = RuntimeError("rate limited")
+    store = JobStore(tmp_path / "jobs.db")
+    queue = JobQueue(store, run_crew, poll_interval=0.01)
+
+    with (
+        patch("screenplay_writer_agent.main.crew", mock_crew),
+        patch("screenplay_writer_agent.main.prompt_cache", PromptCache()),
+    ):
+        await queue.start()
+        job = queue.submit("A heist in Paris gone wrong")
+        for _ in range(200):
+            if store.get(job.id).status == "failed":
+                break
+            await asyncio.sleep(0.01)
+        await queue.stop()
+
+    failed = store.get(job.id)
+    store.close()
+    assert failed.status == "failed"
+    assert failed.error == "rate limited"
+    assert failed.result is None
@@ -0,0 +1,92 @@
+"""Tests for memory accounting and crew recycling decisions."""
+
+import asyncio
+
+import pytest
+
+from screenplay_writer_agent.memory import (
+    RECYCLE_REASON_REQUESTS,
+    RECYCLE_REASON_RSS,
+    MemoryConfig,
+    MemoryMonitor,
+    current_rss_bytes,
+)
+
+
+@pytest.mark.asyncio
+async def test_track_records_allocation_sites_when_sampled():
+    """Test that a sampled request reports its allocating call sites."""
+    monitor = MemoryMonitor(MemoryConfig(trace_sample_rate=1.0))
+
+    async with monitor.track():
+        retained = [bytearray(1024) for _ in range(200)]
+
+    assert retained
+    assert monitor.stats.traced_requests == 1
+    assert monitor.stats.net_bytes > 200 * 1024
+    top_site, _ = monitor.stats.sites.most_common(1)[0]
+    assert "test_memory.py" in top_site
+    assert "test_memory.py" in monitor.report()
+
+
+@pytest.mark.asyncio
+async def test_track_without_sampling_only_counts_requests():
+    """Test that unsampled requests are counted but not traced."""
+    monitor = MemoryMonitor(MemoryConfig(trace_sample_rate=0.0))
+
+    async with monitor.track():
+        pass
+
+    assert monitor.requests_since_recycle == 1
+    assert monitor.stats.traced_requests == 0
+
+
+@pytest.mark.asyncio
+async def test_recycle_after_max_requests():
+    """Test that the crew is recycled after the configured number of requests."""
+    monitor = MemoryMonitor(MemoryConfig(crew_max_requests=2))
+
+    async with monitor.track():
+        pass
+    assert monitor.recycle_reason() is None
+    async with monitor.track():
+        pass
+    assert monitor.recycle_reason() == RECYCLE_REASON_REQUESTS
+
+    event = monitor.record_recycle(RECYCLE_REASON_REQUESTS)
+    assert event.requests == 2
+    assert monitor.requests_since_recycle == 0
+    assert monitor.recycle_reason() is None
+
+
+@pytest.mark.asyncio
+async def test_overlapping_requests_are_not_traced():
+    """Test that a trace is discarded when another request runs alongside it."""
+    monitor = MemoryMonitor(MemoryConfig(trace_sample_rate=1.0))
+    first_started = asyncio.Event()
+
+    async def first() -> None:
+        async with monitor.track("first"):
+            first_started.set()
+            await asyncio.sleep(0.05)
+
+    async def second() -> None:
+        await first_started.wait()
+        async with monitor.track("second"):
+            pass
+
+    await asyncio.gather(first(), second())
+
+    assert monitor.requests_since_recycle == 2
+    assert monitor.stats.traced_requests == 0
+
+
+def test_rss_budget_with_cooldown():
+    """Test that exceeding the RSS budget triggers a recycle at most once per cooldown."""
+    budget_mb = current_rss_bytes() / 1024 / 1024 / 2
+    monitor = MemoryMonitor(MemoryConfig(budget_mb=budget_mb, recycle_cooldown_seconds=3600))
+
+    assert monitor.recycle_reason() == RECYCLE_REASON_RSS
+    monitor.record_recycle(RECYCLE_REASON_RSS)
+    assert monitor.recycle_reason() is None
+    assert next(iter(monitor.events)).reason == RECYCLE_REASON_RSS
@@ -0,0 +1,124 @@
+"""Tests for the opt-in profiling hooks."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from screenplay_writer_agent.profiling import Profiler, ProfilingConfig
+
+
+def _config(tmp_path, **overrides) -> ProfilingConfig:
+    values = {
+        "enabled": True,
+        "sample_rate": 1.0,
+        "directory": str(tmp_path / "profiles"),
+        "sample_interval_ms": 5,
+        "slow_callback_ms": 50,
+    }
+    values.update(overrides)
+    return ProfilingConfig(**values)
+
+
+@pytest.mark.asyncio
+async def test_profile_decorator_dumps_sampled_calls(tmp_path):
+    """Test that sampled calls are written as cProfile dumps and others are not."""
+    profiler = Profiler(_config(tmp_path))
+
+    @profiler.profile
+    async def work() -> str:
+        return "done"
+
+    assert await work() == "done"
+    assert len(list((tmp_path / "profiles").glob("work-*.prof"))) == 1
+
+    profiler.config.sample_rate = 0.0
+    assert await work() == "done"
+    assert len(list((tmp_path / "profiles").glob("work-*.prof"))) == 1
+
+
+@pytest.mark.asyncio
+async def test_profile_dump_is_written_off_the_event_loop(tmp_path):
+    """Test that cProfile dumps are written from a worker thread, not the loop thread."""
+    profiler = Profiler(_config(tmp_path))
+    writers = []
+    dump = profiler._dump_profile
+    profiler._dump_profile = lambda profile, name: (writers.append(threading.get_ident()), dump(profile, name))
+
+    @profiler.profile
+    async def work() -> str:
+        return "done"
+
+    await work()
+
+    assert writers
+    assert threading.get_ident() not in writers
+    assert len(list((tmp_path / "profiles").glob("work-*.prof"))) == 1
+
+
+@pytest.mark.asyncio
+async def test_disabled_profiler_is_a_no_op(tmp_path):
+    """Test that nothing is started or written unless profiling is opted into."""
+    profiler = Profiler(_config(tmp_path, enabled=False))
+    profiler.start()
+
+    @profiler.profile
+    async def work() -> int:
+        return 1
+
+    assert await work() == 1
+    assert profiler.sampler is None
+    assert not (tmp_path / "profiles").exists()
+
+
+def test_dump_stacks_writes_collapsed_format(tmp_path):
+    """Test that the stack sampler produces flamegraph-ready collapsed stacks."""
+    profiler = Profiler(_config(tmp_path))
+    profiler.start()
+    try:
+        deadline = time.monotonic() + 0.2
+        while time.monotonic() < deadline:
+            sum(range(1000))
+        path = profiler.dump_stacks()
+    finally:
+        profiler.stop()
+
+    lines = path.read_text().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert stack.startswith("MainThread;")
+    assert int(count) > 0
+
+
+@pytest.mark.asyncio
+async def test_watchdog_reports_blocking_coroutine(tmp_path):
+    """Test that a synchronous call blocking the loop is reported with its stack."""
+    profiler = Profiler(_config(tmp_path))
+    profiler.watch_loop(asyncio.get_running_loop())
+    try:
+        await asyncio.sleep(0.1)
+
+        def blocking_kickoff() -> None:
+            time.sleep(0.3)
+
+        blocking_kickoff()
+        await asyncio.sleep(0.1)
+    finally:
+        profiler.stop()
+
+    assert profiler.stalls
+    assert "blocking_kickoff" in profiler.stalls[0]
+    assert list((tmp_path / "profiles").glob("stall-*.txt"))
+
+
+def test_disk_budget_removes_oldest_dumps(tmp_path):
+    """Test that dumps beyond the disk budget are deleted oldest first."""
+    profiler = Profiler(_config(tmp_path, max_disk_mb=0.01))
+    for _ in range(5):
+        profiler._write("stacks", "collapsed", "x" * 4096)
+        time.sleep(0.01)
+
+    sizes = [path.stat().st_size for path in (tmp_path / "profiles").iterdir()]
+    assert sum(sizes) <= 0.01 * 1024 * 1024
+    assert len(sizes) == 2
@@ -0,0 +1,200 @@
+"""Tests for the near-duplicate prompt cache."""
+
+import random
+import time
+
+from screenplay_writer_agent.prompt_cache import (
+    MinHasher,
+    PromptCache,
+    PromptCacheConfig,
+    normalize,
+    replay,
+    shingles,
+)
+
+# Replayed prompt log: each prompt is labelled with the screenplay it asks for. Near misses
+# (another genre, city or character) are labelled differently and must never be served.
+PROMPT_LOG = [
+    ("Write a rom-com scene with two strangers", "romcom-strangers"),
+    ("romantic comedy scene between two strangers", "romcom-strangers"),
+    ("A romcom scene with 2 strangers meeting", "romcom-strangers"),
+    ("Write a horror scene with two strangers", "horror-strangers"),
+    ("A heist in Paris gone wrong", "heist-paris"),
+    ("Write a screenplay about a heist in Paris that goes wrong", "heist-paris"),
+    ("A heist in Tokyo gone wrong", "heist-tokyo"),
+    ("Sci-fi thriller about an AI that becomes self-aware on a space station", "ai-station"),
+    ("science fiction thriller: an AI becomes self-aware aboard a space station", "ai-station"),
+    ("A sci-fi comedy about an AI that becomes self-aware on a space station", "ai-station-comedy"),
+    ("Two detectives argue in a rainy car outside a warehouse", "detectives-car"),
+    ("two detectives arguing in a car in the rain outside a warehouse", "detectives-car"),
+    ("Two detectives argue in a rainy car outside a diner", "detectives-diner"),
+    ("A mother and daughter reconcile at a hospital bedside", "mother-hospital"),
+    ("Mother and daughter reconciling at the hospital bedside", "mother-hospital"),
+    ("A father and son reconcile at a hospital bedside", "father-hospital"),
+    ("INT. KITCHEN - NIGHT. A couple argues about money", "kitchen-money"),
+    ("int kitchen night, a couple arguing about money", "kitchen-money"),
+    ("Opening scene of a western where a stranger rides into a dusty town", "western-opening"),
+    ("Write the opening scene of a western: a stranger rides into a dusty town", "western-opening"),
+    ("A zombie apocalypse survivor finds a working radio", "zombie-radio"),
+    ("zombie apocalypse: a survivor finds a radio that works", "zombie-radio"),
+    ("A vampire finds a working radio", "vampire-radio"),
+    ("Courtroom drama where the defendant confesses on the stand", "courtroom-confess"),
+    ("A courtroom drama scene in which the defendant confesses on the stand", "courtroom-confess"),
+    ("Courtroom drama where the judge confesses on the stand", "courtroom-judge"),
+    ("A detective confronts his partner", "detective-his-partner"),
+    ("A detective confronts her partner", "detective-her-partner"),
+    ("She leaves him at the airport", "she-leaves-him"),
+    ("He leaves her at the airport", "he-leaves-her"),
+    ("A scene about a lonely robot", "robot-scene"),
+    ("A short scene about a lonely robot", "robot-short-scene"),
+]
+
+
+def _cache(**overrides) -> PromptCache:
+    return PromptCache(PromptCacheConfig(enabled=True, **overrides))
+
+
+def test_normalize_folds_phrasing():
+    """Test that boilerplate, synonyms, numbers and inflections are normalized away."""
+    assert normalize("Write a rom-com scene with 2 strangers") == ["romantic", "comedy", "scen", "two", "stranger"]
+    assert normalize("Write a script") == normalize("a screenplay")
+    assert normalize("couple arguing") == normalize("couples argue")
+
+
+def test_rephrased_prompt_hits():
+    """Test that a reworded prompt is served the cached response."""
+    cache = _cache()
+    cache.put("Write a rom-com scene with two strangers", "SCRIPT")
+
+    hit = cache.get("romantic comedy scene between two strangers")
+
+    assert hit is not None
+    assert hit.value == "SCRIPT"
+    assert hit.similarity == 1.0
+    assert cache.stats.hits == 1
+
+
+def test_different_genre_misses():
+    """Test that changing the genre is not treated as a duplicate."""
+    cache = _cache()
+    cache.put("Write a rom-com scene with two strangers", "SCRIPT")
+
+    assert cache.get("Write a horror scene with two strangers") is None
+    assert cache.stats.misses == 1
+
+
+def test_pronouns_and_length_words_are_kept():
+    """Test that prompts differing only in a pronoun or a length word are not duplicates."""
+    cache = _cache()
+    cache.put("A detective confronts his partner", "HIS")
+    cache.put("She leaves him at the airport", "SHE")
+    cache.put("A scene about a lonely robot", "SCENE")
+
+    assert cache.get("A detective confronts her partner") is None
+    assert cache.get("He leaves her at the airport") is None
+    assert cache.get("A short scene about a lonely robot") is None
+
+
+def test_non_latin_prompts_are_compared_by_their_own_text():
+    """Test that prompts in other scripts are tokenized rather than dropped."""
+    cache = _cache()
+    cache.put("写一个关于两个陌生人的浪漫喜剧场景", "ROMCOM")
+
+    assert normalize("Сцена в Париже") == ["сцена", "в", "париже"]
+    assert cache.get("写一个关于两个陌生人的浪漫喜剧场景").value == "ROMCOM"
+    assert cache.get("写一个关于僵尸末日幸存者的恐怖场景") is None
+
+
+def test_threshold_is_tunable():
+    """Test that a lower threshold accepts looser matches."""
+    strict, loose = _cache(threshold=0.9), _cache(threshold=0.7)
+    for cache in (strict, loose):
+        cache.put("Write a rom-com scene with two strangers", "SCRIPT")
+
+    prompt = "A romcom scene with 2 strangers meeting"
+    assert strict.get(prompt) is None
+    assert loose.get(prompt) is not None
+
+
+def test_disabled_cache_stores_nothing():
+    """Test that the cache is a no-op unless enabled."""
+    cache = PromptCache()
+
+    assert not cache.put("Write a rom-com scene with two strangers", "SCRIPT")
+    assert cache.get("Write a rom-com scene with two strangers") is None
+    assert len(cache) == 0
+
+
+def test_short_prompts_are_not_cached():
+    """Test that prompts with too little content never match."""
+    cache = _cache()
+
+    assert not cache.put("Write a screenplay", "SCRIPT")
+    assert len(cache) == 0
+
+
+def test_expired_entries_are_evicted():
+    """Test that entries past their TTL are dropped on lookup."""
+    cache = _cache()
+    cache.put("A heist in Paris gone wrong", "SCRIPT", ttl_seconds=0)
+
+    assert cache.get("A heist in Paris gone wrong") is None
+    assert len(cache) == 0
+    assert cache.stats.evictions == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Test that the cache keeps at most max_entries, dropping the least recently used."""
+    cache = _cache(max_entries=2)
+    cache.put("A heist in Paris gone wrong", "PARIS")
+    cache.put("A heist in Tokyo gone wrong", "TOKYO")
+    assert cache.get("A heist in Paris gone wrong").value == "PARIS"
+
+    cache.put("A heist in Cairo gone wrong", "CAIRO")
+
+    assert len(cache) == 2
+    assert cache.get("A heist in Tokyo gone wrong") is None
+    assert cache.get("A heist in Paris gone wrong").value == "PARIS"
+
+
+def test_signature_estimates_similarity():
+    """Test that matching signature slots track the Jaccard similarity."""
+    hasher = MinHasher(256)
+    first = shingles("A zombie apocalypse survivor finds a working radio in an abandoned mall")
+    second = shingles("A zombie apocalypse survivor finds a broken radio in an abandoned mall")
+    exact = len(first & second) / len(first | second)
+
+    matches = sum(a == b for a, b in zip(hasher.signature(first), hasher.signature(second), strict=True))
+
+    assert abs(matches / 256 - exact) < 0.15
+
+
+def test_replay_trades_hit_rate_against_false_matches():
+    """Test hit rate and false-match rate on a replayed prompt log at several thresholds."""
+    default = replay(PROMPT_LOG)
+    loose = replay(PROMPT_LOG, PromptCacheConfig(enabled=True, threshold=0.5))
+
+    # At the default threshold no prompt is served another prompt's screenplay
+    assert default.false_matches == 0
+    assert default.hit_rate >= 0.5
+    # Loosening the threshold catches more rewordings at the cost of false matches
+    assert loose.hit_rate > default.hit_rate
+    assert loose.false_match_rate > 0
+
+
+def test_lookup_stays_sub_millisecond_at_100k_entries():
+    """Test that lookups do not slow down as the index grows."""
+    rng = random.Random(7)  # noqa: S311
+    cache = _cache(max_entries=100_000)
+    entries = [{rng.getrandbits(64) for _ in range(32)} for _ in range(100_000)]
+    for hashes in entries:
+        cache._add(hashes, "SCRIPT", 3600)
+
+    probes = [*rng.sample(entries, 500), *({rng.getrandbits(64) for _ in range(32)} for _ in range(500))]
+    started = time.perf_counter()
+    hits = sum(cache._lookup(hashes) is not None for hashes in probes)
+    elapsed = time.perf_counter() - started
+
+    assert len(cache) == 100_000
+    assert hits == 500
+    assert elapsed / len(probes) < 0.001
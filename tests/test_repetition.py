@@ -0,0 +1,55 @@
+"""Tests for runaway repetition detection."""
+
+from screenplay_writer_agent.repetition import RepetitionDetector, trim_repetition
+
+HEADER = "FADE IN:\n\nEXT. CITY STREET - NIGHT\n\nRain pours down heavily.\n\n"
+EXCHANGE = (
+    "JAMES\nWe can't stop now. They're right behind us and closing fast.\n\n"
+    "Sarah grabs the wheel and swerves hard into the narrow alley.\n\n"
+)
+
+
+def test_trim_repetition_keeps_one_copy_of_loop():
+    """Test that a looping exchange is cut back to its first copy."""
+    text, looped = trim_repetition(HEADER + EXCHANGE * 8)
+
+    assert looped
+    assert text.startswith(HEADER)
+    assert text.count("We can't stop now") == 1
+    assert text.count("swerves hard") == 1
+
+
+def test_trim_repetition_keeps_scenes_after_loop():
+    """Test that only the duplicate copies are removed, not the scenes that follow the loop."""
+    ending = "EXT. HARBOR - DAWN\n\nThe car rolls to a stop at the water's edge.\n\nFADE OUT.\n"
+
+    text, looped = trim_repetition(HEADER + EXCHANGE * 5 + ending)
+
+    assert looped
+    assert text == HEADER + EXCHANGE + ending
+
+
+def test_trim_repetition_ignores_short_legitimate_repeats():
+    """Test that brief repeated beats below the size threshold are left alone."""
+    text = HEADER + "JAMES\nNo.\n\n" * 3 + "James sprints down the alley.\n"
+
+    trimmed, looped = trim_repetition(text)
+
+    assert not looped
+    assert trimmed == text
+
+
+def test_detector_stops_streamed_generation_early():
+    """Test that streaming stops as soon as the loop crosses the threshold."""
+    text = HEADER + EXCHANGE * 50
+    detector = RepetitionDetector()
+
+    consumed = 0
+    for start in range(0, len(text), 16):
+        consumed = start + 16
+        if detector.feed(text[start:consumed]):
+            break
+
+    assert detector.detected
+    assert consumed < len(HEADER) + len(EXCHANGE) * 4
+    assert detector.text().count("We can't stop now") == 1